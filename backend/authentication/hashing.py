@@ -0,0 +1,64 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+class PoolSaturated(Exception):
+    """Raised when the pool's queue is full; ``retry_after`` is a suggested wait in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Worker pool is saturated; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class BoundedPool:
+    """A thread pool for slow CPU-bound calls with a hard limit on queued work.
+
+    bcrypt releases the GIL while hashing, so threads run it in parallel and
+    keep it off the event loop. At most ``workers`` calls run and ``max_queue``
+    wait; beyond that ``run`` fails fast with PoolSaturated instead of letting
+    latency grow without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int, name: str = "pool"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._pending = 0
+        self._avg_seconds = 0.2
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Calls running or queued."""
+        return self._pending
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturated(self._retry_after())
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._timed, func, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _timed(self, func: Callable[..., Any], args: tuple) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._avg_seconds += 0.1 * (elapsed - self._avg_seconds)
+
+    def _retry_after(self) -> int:
+        # Time for the current backlog to drain, rounded up to whole seconds
+        return max(1, math.ceil(self._pending * self._avg_seconds / self.workers))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
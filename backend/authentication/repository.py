@@ -0,0 +1,155 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Fields every user record is given on load
+USER_DEFAULTS = {
+    "ratings": {},
+    "reports_made": [],
+}
+
+class UserRepository:
+    """In-memory users with hash indexes on user_id, username and lowercase email.
+
+    Records are loaded once; lookups never touch the file. Mutations mark the
+    record dirty and ``flush`` hands the dirty records (together with the full
+    set, for backends that can only rewrite everything) to ``save``, which
+    returns a ticket. ``wait`` is called with that ticket after the lock is
+    released, so concurrent writers can share one write. Records handed out
+    are copies, so changes must go through ``add``/``update_fields``.
+    """
+
+    def __init__(
+        self,
+        users: Iterable[Dict[str, Any]],
+        save: Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], Optional[int]],
+        lock: Optional[threading.RLock] = None,
+        wait: Optional[Callable[[Optional[int]], None]] = None,
+    ):
+        self._save = save
+        self._wait = wait or (lambda ticket: None)
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._by_username: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        self._dirty: set = set()
+        self.lock = lock or threading.RLock()
+        for user in users:
+            for field, default in USER_DEFAULTS.items():
+                user.setdefault(field, copy.deepcopy(default))
+            self._index(user)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [copy.deepcopy(user) for user in self._users.values()]
+
+    def get_by_id(self, user_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        user = self._users.get(user_id)
+        return copy.deepcopy(user) if user is not None else None
+
+    def get_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        return self.get_by_id(self._by_username.get(username))
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return self.get_by_id(self._by_email.get(email.lower()))
+
+    def exists(self, username: str, email: str) -> Tuple[bool, Optional[str]]:
+        username_taken = username in self._by_username
+        email_taken = email.lower() in self._by_email
+
+        if username_taken and email_taken:
+            return True, "Username and Email already taken"
+        elif username_taken:
+            return True, "Username already taken"
+        elif email_taken:
+            return True, "Email already taken"
+        else:
+            return False, None
+
+    def add(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a new user; raises ValueError if the username or email is taken."""
+        with self.lock:
+            exists, message = self.exists(user["username"], user["email"])
+            if exists:
+                raise ValueError(message)
+            user = copy.deepcopy(user)
+            for field, default in USER_DEFAULTS.items():
+                user.setdefault(field, copy.deepcopy(default))
+            self._index(user)
+            self._dirty.add(user["user_id"])
+            ticket = self._write()
+            user = copy.deepcopy(user)
+        self._wait(ticket)
+        return user
+
+    def update_fields(self, user_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update some fields of one user, returning the updated record or None."""
+        with self.lock:
+            user = self._update(user_id, updates)
+            if user is None:
+                return None
+            ticket = self._write()
+            user = copy.deepcopy(user)
+        self._wait(ticket)
+        return user
+
+    def update_many(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update several users ({user_id: fields}) with a single write; returns how many were found."""
+        with self.lock:
+            updated = sum(self._update(user_id, fields) is not None for user_id, fields in updates.items())
+            ticket = self._write()
+        self._wait(ticket)
+        return updated
+
+    def replace_all(self, users: Iterable[Dict[str, Any]]) -> None:
+        """Replace every record, e.g. for callers that still save a whole user list."""
+        with self.lock:
+            self._users.clear()
+            self._by_username.clear()
+            self._by_email.clear()
+            for user in users:
+                self._index(copy.deepcopy(user))
+            self._dirty = set(self._users)
+            ticket = self._write()
+        self._wait(ticket)
+
+    def flush(self) -> None:
+        """Persist dirty records, if any."""
+        with self.lock:
+            ticket = self._write()
+        self._wait(ticket)
+
+    def _write(self) -> Optional[int]:
+        if not self._dirty:
+            return None
+        dirty = [self._users[user_id] for user_id in self._dirty if user_id in self._users]
+        ticket = self._save(dirty, list(self._users.values()))
+        self._dirty.clear()
+        return ticket
+
+    def _update(self, user_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Called with the lock held; the caller writes the dirty record
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        if "username" in updates and self._by_username.get(updates["username"], user_id) != user_id:
+            raise ValueError("Username already taken")
+        if "email" in updates and self._by_email.get(updates["email"].lower(), user_id) != user_id:
+            raise ValueError("Email already taken")
+
+        self._unindex(user)
+        user.update(copy.deepcopy(updates))
+        self._index(user)
+        self._dirty.add(user_id)
+        return user
+
+    def _index(self, user: Dict[str, Any]) -> None:
+        self._users[user["user_id"]] = user
+        self._by_username[user["username"]] = user["user_id"]
+        self._by_email[user["email"].lower()] = user["user_id"]
+
+    def _unindex(self, user: Dict[str, Any]) -> None:
+        self._by_username.pop(user["username"], None)
+        self._by_email.pop(user["email"].lower(), None)
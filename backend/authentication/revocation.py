@@ -0,0 +1,147 @@
+import heapq
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.serialization.utils import dumps, loads
+
+logger = logging.getLogger("uvicorn.error")
+
+class RevocationList:
+    """Revoked token ids (jti), kept until their tokens would have expired anyway.
+
+    Membership is a dict lookup. A heap ordered by expiry drops entries once
+    their tokens are dead. Revocations are appended to one log file per
+    ``bucket_seconds`` of expiry time. A bucket's file is deleted once every
+    token in it has expired, so the logs never need rewriting. Other worker
+    processes append to the same files; once ``start`` is called, a background
+    thread reads the new tails every ``refresh_interval`` seconds so their
+    revocations apply here too, and ``is_revoked`` never touches the disk.
+    """
+
+    def __init__(self, directory: Path, fsync: bool = True, refresh_interval: float = 1.0, bucket_seconds: int = 3600):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.refresh_interval = refresh_interval
+        self.bucket_seconds = bucket_seconds
+        self._revoked: Dict[str, float] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._offsets: Dict[str, int] = {}
+        # Guards the in-memory dict and heap only; never held during file I/O
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def start(self) -> None:
+        """Load the existing logs, then keep refreshing from them in a daemon thread."""
+        self.refresh()
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="revocation-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            return False
+        if self._expiry and self._expiry[0][0] <= time.time():
+            with self._lock:
+                self._purge(time.time())
+        return jti in self._revoked
+
+    def revoke(self, jti: str, exp: float) -> None:
+        """Revoke ``jti`` until ``exp`` (epoch seconds) and append it to its bucket's log."""
+        if exp <= time.time():
+            return
+        line = dumps({"jti": jti, "exp": exp}) + b"\n"
+        with self._lock:
+            self._add(jti, exp)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._bucket_file(exp), "ab") as f:
+            f.write(line)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def refresh(self) -> None:
+        """Read revocations appended since the last refresh and drop expired ones."""
+        with self._refresh_lock:
+            now = time.time()
+            try:
+                names = os.listdir(self.directory)
+            except FileNotFoundError:
+                names = []
+            records: List[Dict[str, Any]] = []
+            for name in names:
+                if not name.endswith(".log"):
+                    continue
+                try:
+                    bucket = int(name[:-4])
+                except ValueError:
+                    continue
+                path = self.directory / name
+                if bucket + self.bucket_seconds <= now:
+                    # Every token in this bucket has expired
+                    self._offsets.pop(name, None)
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                records.extend(self._read_tail(name, path))
+            with self._lock:
+                for record in records:
+                    self._add(record["jti"], record["exp"])
+                self._purge(now)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except OSError:
+                logger.exception("Refreshing token revocations failed")
+
+    def _read_tail(self, name: str, path: Path) -> List[Dict[str, Any]]:
+        offset = self._offsets.get(name, 0)
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        # A torn last line is left to be read once it is complete
+        complete = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:complete].splitlines():
+            try:
+                records.append(loads(line))
+            except ValueError:
+                continue
+        self._offsets[name] = offset + complete
+        return records
+
+    def _bucket_file(self, exp: float) -> Path:
+        bucket = int(exp // self.bucket_seconds) * self.bucket_seconds
+        return self.directory / f"{bucket}.log"
+
+    def _add(self, jti: str, exp: float) -> None:
+        if jti not in self._revoked:
+            self._revoked[jti] = exp
+            heapq.heappush(self._expiry, (exp, jti))
+
+    def _purge(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, jti = heapq.heappop(self._expiry)
+            self._revoked.pop(jti, None)
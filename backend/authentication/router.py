@@ -1,14 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, status
-from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.security import OAuth2PasswordRequestForm, HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from backend.authentication import schemas, utils, security
+from backend.dashboard import utils as dashboard_utils
 import os, uuid
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post('/register', response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user: schemas.UserCreate):
-    users = utils.load_users()
-    exists, message = utils.user_exists(users, user.username, user.email)
+    # Loading users and writing them back touch disk, so keep them off the event loop
+    users = await run_in_threadpool(utils.get_user_repository)
+    exists, message = users.exists(user.username, user.email)
     if exists:
         raise HTTPException(status_code=400, detail=message)
     
@@ -16,13 +19,16 @@ async def register(user: schemas.UserCreate):
         "user_id": str(uuid.uuid4()),
         "username": user.username,
         "email": user.email,
-        "hashed_password": security.hash_password(user.password),
+        "hashed_password": await security.hash_password_async(user.password),
         "role": user.role.value,
         "penalties": [],
     }
 
-    users.append(new_user)
-    utils.save_users(users)
+    try:
+        await run_in_threadpool(users.add, new_user)
+    except ValueError as e:
+        # Lost a race with a concurrent registration
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "user_id": new_user["user_id"],
@@ -34,10 +40,9 @@ async def register(user: schemas.UserCreate):
 
 @router.post('/login', response_model=schemas.Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    users = utils.load_users()
-    user = next((u for u in users if u["username"] == form_data.username), None)
+    user = await run_in_threadpool(utils.get_user_by_username, form_data.username)
 
-    if not user or not security.verify_password(form_data.password, user["hashed_password"]):
+    if not user or not await security.verify_password_async(form_data.password, user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
@@ -54,6 +59,14 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     }
 
 @router.post('/logout')
-async def logout():
-    """Simple logout endpoint - client should discard the token"""
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False))):
+    """Logout endpoint - revokes the presented token server-side until it expires"""
+    if credentials:
+        await run_in_threadpool(security.revoke_token, credentials.credentials)
+    return {"message": "Successfully logged out"}
+
+@router.get('/token-cache')
+@dashboard_utils.require_role(schemas.UserRole.ADMINISTRATOR)
+def get_token_cache_stats(current_user: schemas.TokenData = Depends(security.get_current_user)):
+    """Hit rate and size of this worker's verified-token cache"""
+    return security.token_cache.stats()
\ No newline at end of file
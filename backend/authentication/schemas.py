@@ -55,6 +55,8 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[str] = None
     role: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
 
 class ReportCreate(BaseModel):
     reason: str
@@ -1,4 +1,4 @@
-import os
+import os, uuid
 from passlib.context import CryptContext
 from datetime import datetime, timezone, timedelta
 from typing import Optional
@@ -6,6 +6,10 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from backend.authentication import schemas
+from backend.authentication.hashing import BoundedPool, PoolSaturated
+from backend.authentication.revocation import RevocationList
+from backend.authentication.token_cache import TokenCache
+from backend.storage.utils import DATA_DIR, STORAGE_FSYNC
 
 security_scheme = HTTPBearer()
 
@@ -17,17 +21,56 @@ ALGORITHM = "HS256"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified tokens, so repeat requests skip jwt.decode; per worker process
+token_cache = TokenCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300")),
+)
+
+# jtis of logged-out tokens; checked on every authenticated request
+revocations = RevocationList(
+    DATA_DIR / "revoked_tokens",
+    fsync=STORAGE_FSYNC,
+    refresh_interval=float(os.getenv("REVOCATION_REFRESH_SECONDS", "1.0")),
+)
+
+# bcrypt runs here instead of on the event loop; excess logins get a 503 rather than a stall
+password_pool = BoundedPool(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.getenv("PASSWORD_HASH_QUEUE", "64")),
+    name="password-hash",
+)
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def _run_password_task(func, *args):
+    try:
+        return await password_pool.run(func, *args)
+    except PoolSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bounded password pool; raises 503 with Retry-After when it is full"""
+    return await _run_password_task(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded password pool; raises 503 with Retry-After when it is full"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({ 
         "exp": expire,
+        "jti": uuid.uuid4().hex,
     })
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -40,16 +83,37 @@ def verify_access_token(token: str) -> Optional[dict]:
     except jwt.PyJWTError:
         return None
     
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)):
     token = credentials.credentials
-    payload = verify_access_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+    token_data = token_cache.get(token)
+    if token_data is None:
+        payload = verify_access_token(token)
+        if not payload:
+            raise _credentials_exception()
+        token_data = schemas.TokenData(
+            user_id=payload["sub"], role=payload["role"], jti=payload.get("jti"), exp=payload.get("exp")
         )
-    return schemas.TokenData(user_id=payload["sub"], role=payload["role"])
+        token_cache.put(token, token_data, payload.get("exp"))
+    # Checked on cache hits too: another worker may have revoked the token
+    if revocations.is_revoked(token_data.jti):
+        raise _credentials_exception()
+    return token_data
+
+def revoke_token(token: str) -> bool:
+    """Revoke a token until it expires and drop it from the token cache. False if it was not valid."""
+    token_cache.evict(token)
+    payload = verify_access_token(token)
+    if not payload or not payload.get("jti"):
+        return False
+    revocations.revoke(payload["jti"], payload["exp"])
+    return True
 
 # Helper function to get guest token data
 def get_guest_user():
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from backend.authentication import schemas
+
+class TokenCache:
+    """Bounded LRU of verified tokens -> decoded TokenData.
+
+    Keys are SHA-256 digests, so raw tokens are never kept in memory. An entry
+    lives for at most ``ttl`` seconds and never past the token's own ``exp``.
+    Cached TokenData objects are shared between requests and must not be
+    mutated.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[bytes, Tuple[schemas.TokenData, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[schemas.TokenData]:
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                token_data, expires_at = entry
+                if now < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return token_data
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, token_data: schemas.TokenData, exp: Optional[float]) -> None:
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+        if self.maxsize <= 0:
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (token_data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, token: str) -> bool:
+        """Drop a token, e.g. on logout. Returns whether it was cached."""
+        with self._lock:
+            return self._entries.pop(self.digest(token), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "pid": os.getpid(),
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
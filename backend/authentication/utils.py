@@ -1,47 +1,59 @@
-import os, json
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Hashable
+from backend.authentication.repository import UserRepository
+from backend.storage.utils import get_storage
 
-USERS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'users.json')
+_repository: Optional[UserRepository] = None
+_repository_source: Optional[Hashable] = None
+# Shared by the repository's writes and reloads so a reload never reads a half-written file
+_repository_lock = threading.RLock()
 
-def user_exists(users: List[Dict[str, Any]], username: str, email: str) -> tuple[bool, Optional[str]]:
-    username_taken = any(user["username"] == username for user in users)
-    email_taken = any(user["email"] == email for user in users)
+def _write_users(dirty: List[Dict[str, Any]], users: List[Dict[str, Any]]) -> int:
+    # Every record dirty means replace_all, which may also have dropped users
+    return get_storage().users.write(users, changed=dirty if len(dirty) < len(users) else None)
 
-    if username_taken and email_taken:
-        return True, "Username and Email already taken"
-    elif username_taken:
-        return True, "Username already taken"
-    elif email_taken:
-        return True, "Email already taken"
-    else:
-        return False, None
+def _wait_users(ticket: Optional[int]) -> None:
+    global _repository_source
+    if ticket is None:
+        return
+    collection = get_storage().users
+    collection.wait(ticket)
+    _repository_source = collection.signature()
+
+def get_user_repository() -> UserRepository:
+    """The in-memory user repository, reloaded only if users changed outside this module."""
+    global _repository, _repository_source
+    collection = get_storage().users
+    source = collection.signature()
+    if _repository is not None and source == _repository_source:
+        return _repository
+    with _repository_lock:
+        # Writes already queued are ours; let them land before comparing
+        collection.sync()
+        if _repository is None or collection.signature() != _repository_source:
+            _repository_source = collection.signature()
+            _repository = UserRepository(
+                collection.load(), save=_write_users, lock=_repository_lock, wait=_wait_users
+            )
+        return _repository
 
 def load_users() -> List[Dict[str, Any]]:
-    with open(USERS_FILE, "r") as f:
-        try:
-            users = json.load(f)
-            # Ensure all users have the new fields
-            for user in users:
-                user.setdefault("watch_later", [])
-                user.setdefault("ratings", {})
-                user.setdefault("reports_made", [])
-            return users
-        except json.JSONDecodeError:
-            return []
+    """All users, as copies of the repository's records."""
+    return get_user_repository().all()
 
 def save_users(users: List[Dict[str, Any]]) -> None:
-    with open(USERS_FILE, "w") as f:
-        json.dump(users, f, indent=4)
+    """Replace every user record; prefer update_user for single-user changes."""
+    get_user_repository().replace_all(users)
 
 def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
-    users = load_users()
-    return next((u for u in users if u["user_id"] == user_id), None)
+    return get_user_repository().get_by_id(user_id)
+
+def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
+    return get_user_repository().get_by_username(username)
 
 def update_user(user_id: str, updates: Dict[str, Any]) -> bool:
-    users = load_users()
-    for user in users:
-        if user["user_id"] == user_id:
-            user.update(updates)
-            save_users(users)
-            return True
-    return False
\ No newline at end of file
+    return get_user_repository().update_fields(user_id, updates) is not None
+
+def update_users(updates: Dict[str, Dict[str, Any]]) -> int:
+    """Update several users ({user_id: fields}) in one write; returns how many exist"""
+    return get_user_repository().update_many(updates)
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Set, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class DataLoader(Generic[K, V]):
+    """Batches and memoizes lookups of one kind of entity for one request.
+
+    ``load`` calls made in the same event-loop turn are collected and resolved
+    by a single ``batch_fn(keys)`` call, which must return one value per key in
+    order. It runs in the threadpool since stores may touch disk, so loaders
+    awaited together with asyncio.gather fetch concurrently. Each key is
+    fetched at most once per loader.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], List[V]]):
+        self.batch_fn = batch_fn
+        self.batches = 0
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        # The event loop only keeps weak references to tasks; hold them until done
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: K) -> "asyncio.Future[V]":
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Dispatch on the next turn, once every load() of this turn is queued
+                loop.call_soon(self._schedule_dispatch, loop)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule_dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = loop.create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        self.batches += 1
+        try:
+            values = list(await run_in_threadpool(self.batch_fn, keys))
+            if len(values) != len(keys):
+                raise ValueError(f"batch_fn returned {len(values)} values for {len(keys)} keys")
+        except Exception as e:
+            for key in keys:
+                self._futures[key].set_exception(e)
+            return
+        for key, value in zip(keys, values):
+            self._futures[key].set_result(value)
@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional
+
+from backend.authentication import utils as auth_utils
+from backend.dataloader.loader import DataLoader
+from backend.movies import utils as movie_utils
+from backend.ratings import utils as ratings_utils
+from backend.reports import utils as report_utils
+
+def _users(user_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+    users = auth_utils.get_user_repository()
+    return [users.get_by_id(user_id) for user_id in user_ids]
+
+def _penalties(user_ids: List[str]) -> List[List[Dict[str, Any]]]:
+    store = report_utils.get_report_store()
+    return [store.user_penalties(user_id, active_only=True) for user_id in user_ids]
+
+def _user_ratings(user_ids: List[str]) -> List[Dict[str, float]]:
+    store = ratings_utils.get_ratings_store()
+    return [store.user_ratings(user_id) for user_id in user_ids]
+
+def _watch_later(user_ids: List[str]) -> List[List[str]]:
+    return [movie_utils.get_watch_later_ids(user_id) for user_id in user_ids]
+
+def _movies(movie_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+    return movie_utils.get_movies_by_ids(movie_ids)
+
+class RequestLoaders:
+    """One DataLoader per entity, each resolving a whole batch against a single store snapshot."""
+
+    def __init__(self):
+        self.users: DataLoader[str, Optional[Dict[str, Any]]] = DataLoader(_users)
+        self.penalties: DataLoader[str, List[Dict[str, Any]]] = DataLoader(_penalties)
+        self.user_ratings: DataLoader[str, Dict[str, float]] = DataLoader(_user_ratings)
+        self.watch_later: DataLoader[str, List[str]] = DataLoader(_watch_later)
+        self.movies: DataLoader[str, Optional[Dict[str, Any]]] = DataLoader(_movies)
+
+async def get_loaders() -> RequestLoaders:
+    """Dependency giving each request its own loaders; FastAPI reuses it within a request."""
+    return RequestLoaders()
@@ -1,16 +1,37 @@
 from dotenv import load_dotenv
 load_dotenv()
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from backend.authentication import router as authentication_router
+from backend.authentication import security
 from backend.dashboard import router as dashboard_router
 from backend.movies import router as movies_router
+from backend.movies import utils as movie_utils
 from backend.reviews import router as reviews_router
 from backend.ratings import router as ratings_router
 from backend.reports import router as reports_router
+from backend.serialization.responses import FastJSONResponse
+from backend.startup.utils import warmup
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Revocations from other workers are picked up by a background thread, not per request
+    await run_in_threadpool(security.revocations.start)
+    # Before serving, so reads never find a list still waiting in users.json
+    await run_in_threadpool(movie_utils.migrate_watch_later)
+    # Warm caches in the background so /ready can report progress while it runs
+    task = asyncio.create_task(run_in_threadpool(warmup.run))
+    yield
+    # Do not hold up shutdown for warm-up; it stops after its current stage
+    warmup.cancel()
+    task.cancel()
+    await run_in_threadpool(security.revocations.stop)
+
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # Include routers
 app.include_router(authentication_router.router)
@@ -30,4 +51,10 @@ app.add_middleware(
 
 @app.get('/')
 async def read_root():
-    return {"message": "Backend is up"}
\ No newline at end of file
+    return {"message": "Backend is up"}
+
+@app.get('/ready')
+async def read_ready():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    status = warmup.status()
+    return FastJSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from backend.movies.index import MovieIndex
+
+class MovieCatalog:
+    """Process-wide cache of movie metadata, revalidated against file mtimes.
+
+    Movies are kept in an id -> movie dict. At most once per
+    ``revalidate_interval`` seconds the catalog stats the data folder and each
+    known ``metadata.json``; only movies whose file changed are reparsed.
+    Returned movie dicts are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, root: Path, revalidate_interval: float = 1.0):
+        self.root = Path(root)
+        self.revalidate_interval = revalidate_interval
+        self.version = 0
+        self._movies: Dict[str, Dict[str, Any]] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._movie_dirs: List[str] = []
+        self._root_mtime: Optional[int] = None
+        self._checked_at: Optional[float] = None
+        self._index: Optional[MovieIndex] = None
+        self._lock = threading.RLock()
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return every movie in the catalog."""
+        self.refresh()
+        return list(self._movies.values())
+
+    def get(self, movie_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single movie, or None if it does not exist."""
+        self.refresh()
+        return self._movies.get(movie_id)
+
+    def get_many(self, movie_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+        """Return the movie (or None) for each id, against one revalidated snapshot."""
+        self.refresh()
+        movies = self._movies
+        return [movies.get(movie_id) for movie_id in movie_ids]
+
+    def index(self) -> MovieIndex:
+        """Return secondary indexes for the current catalog, rebuilding them after changes."""
+        self.refresh()
+        index = self._index
+        if index is None or index.version != self.version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != self.version:
+                    index = MovieIndex(list(self._movies.values()), version=self.version)
+                    self._index = index
+        return index
+
+    def __contains__(self, movie_id: str) -> bool:
+        self.refresh()
+        return movie_id in self._movies
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._movies)
+
+    def refresh(self, force: bool = False) -> None:
+        """Revalidate the cache if the revalidation interval has elapsed."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.revalidate_interval:
+            return
+
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.revalidate_interval:
+                return
+            self._revalidate()
+            self._checked_at = time.monotonic()
+
+    def _revalidate(self) -> None:
+        try:
+            root_mtime = os.stat(self.root).st_mtime_ns
+        except FileNotFoundError:
+            if self._movies:
+                self._movies = {}
+                self.version += 1
+            self._mtimes = {}
+            self._movie_dirs = []
+            self._root_mtime = None
+            return
+
+        # Only list the folder when its own mtime says movies were added or removed
+        if root_mtime != self._root_mtime:
+            with os.scandir(self.root) as entries:
+                self._movie_dirs = sorted(entry.name for entry in entries if entry.is_dir())
+            self._root_mtime = root_mtime
+
+        movies = dict(self._movies)
+        mtimes = {}
+        changed = False
+
+        for movie_id in self._movie_dirs:
+            metadata_file = self.root / movie_id / "metadata.json"
+            try:
+                mtime = os.stat(metadata_file).st_mtime_ns
+            except FileNotFoundError:
+                if movies.pop(movie_id, None) is not None:
+                    changed = True
+                continue
+
+            if self._mtimes.get(movie_id) == mtime:
+                mtimes[movie_id] = mtime
+                continue
+
+            movie = self._load_movie(movie_id, metadata_file)
+            if movie is None:
+                # Possibly caught mid-write: keep any previous version and retry next time
+                continue
+            mtimes[movie_id] = mtime
+            movies[movie_id] = movie
+            changed = True
+
+        for movie_id in set(movies) - set(self._movie_dirs):
+            del movies[movie_id]
+            changed = True
+
+        self._mtimes = mtimes
+        if changed:
+            # Swap in a new dict so readers never see a half-updated catalog
+            self._movies = {movie_id: movies[movie_id] for movie_id in self._movie_dirs if movie_id in movies}
+            self.version += 1
+
+    @staticmethod
+    def _load_movie(movie_id: str, metadata_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return {"id": movie_id, "metadata": metadata}
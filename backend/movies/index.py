@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+class MovieIndex:
+    """Secondary indexes over one snapshot of the movie catalog.
+
+    Holds a genre -> movie position inverted index, a rating-sorted array that
+    can be bisected for min/max ranges and a date ordering built from parsed
+    ISO dates. Movies are referred to by their position in catalog order.
+    """
+
+    def __init__(self, movies: List[Dict[str, Any]], version: int = 0):
+        self.version = version
+        self.movies = movies
+
+        self.by_genre: Dict[str, List[int]] = {}
+        ratings = []
+        dates = []
+        for pos, movie in enumerate(movies):
+            metadata = movie["metadata"]
+            for genre in metadata.get("movieGenres", []):
+                self.by_genre.setdefault(genre, []).append(pos)
+            ratings.append(metadata["movieIMDbRating"])
+            dates.append(parse_date(metadata.get("datePublished")))
+
+        self.ratings = ratings
+        self.dates = dates
+
+        # Stable sorts keep catalog order among ties, like list.sort did
+        self.rating_order = sorted(range(len(movies)), key=lambda p: ratings[p])
+        self.sorted_ratings = [ratings[p] for p in self.rating_order]
+        self.rating_order_desc = sorted(range(len(movies)), key=lambda p: -ratings[p])
+
+        # Movies without a parseable date always sort last
+        dated = [p for p in range(len(movies)) if dates[p] is not None]
+        undated = [p for p in range(len(movies)) if dates[p] is None]
+        self.date_order = sorted(dated, key=lambda p: dates[p]) + undated
+        self.date_order_desc = sorted(dated, key=lambda p: dates[p], reverse=True) + undated
+
+        self.rank = {
+            ("rating", "asc"): _ranks(self.rating_order),
+            ("rating", "desc"): _ranks(self.rating_order_desc),
+            ("date", "asc"): _ranks(self.date_order),
+            ("date", "desc"): _ranks(self.date_order_desc),
+        }
+
+    def query(
+        self,
+        genre: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        sort_by: Optional[str] = None,
+        order: str = "asc",
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (total matches, requested page) for a filtered, sorted listing."""
+        candidates = self._candidates(genre, min_rating, max_rating)
+        total = len(candidates)
+        end = None if limit is None else skip + limit
+
+        if sort_by in ("rating", "date"):
+            ordering = self._ordering(sort_by, order)
+            if total * 4 >= len(ordering):
+                # Dense result: walking the pre-sorted array beats sorting the candidates
+                matches = set(candidates)
+                positions = [p for p in ordering if p in matches][skip:end]
+            else:
+                rank = self.rank[(sort_by, order)]
+                positions = sorted(candidates, key=rank.__getitem__)[skip:end]
+        else:
+            positions = candidates[skip:end]
+
+        return total, [self.movies[p] for p in positions]
+
+    def _candidates(self, genre: Optional[str], min_rating: Optional[float], max_rating: Optional[float]) -> List[int]:
+        """Intersect the genre and rating indexes, driving from the smaller side."""
+        all_positions = range(len(self.movies))
+        genre_positions = self.by_genre.get(genre, []) if genre else None
+
+        if min_rating is None and max_rating is None:
+            return list(all_positions if genre_positions is None else genre_positions)
+
+        lo = 0 if min_rating is None else bisect_left(self.sorted_ratings, min_rating)
+        hi = len(self.sorted_ratings) if max_rating is None else bisect_right(self.sorted_ratings, max_rating)
+        if lo >= hi:
+            return []
+
+        if genre_positions is not None and len(genre_positions) < hi - lo:
+            low = self.sorted_ratings[lo]
+            high = self.sorted_ratings[hi - 1]
+            return [p for p in genre_positions if low <= self.ratings[p] <= high]
+
+        in_range = self.rating_order[lo:hi]
+        if genre_positions is not None:
+            genre_set = set(genre_positions)
+            in_range = [p for p in in_range if p in genre_set]
+        # Candidates are returned in catalog order
+        in_range.sort()
+        return in_range
+
+    def _ordering(self, sort_by: str, order: str) -> List[int]:
+        if sort_by == "rating":
+            return self.rating_order_desc if order == "desc" else self.rating_order
+        return self.date_order_desc if order == "desc" else self.date_order
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """Parse an ISO ``datePublished`` value, returning None when it is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+def _ranks(ordering: List[int]) -> List[int]:
+    ranks = [0] * len(ordering)
+    for rank, pos in enumerate(ordering):
+        ranks[pos] = rank
+    return ranks
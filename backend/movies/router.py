@@ -1,9 +1,11 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from backend.movies import schemas
 from backend.movies import utils as movie_utils
 from backend.authentication.security import get_current_user
 from backend.authentication import utils as auth_utils
+from backend.dataloader.utils import RequestLoaders, get_loaders
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
@@ -13,23 +15,26 @@ def get_movies(
     min_rating: Optional[float] = None,
     max_rating: Optional[float] = None,
     sort_by: Optional[str] = Query(None, enum=["rating", "date"]),
-    order: Optional[str] = Query("asc", enum=["asc", "desc"])
+    order: Optional[str] = Query("asc", enum=["asc", "desc"]),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
 ):
-    movies = movie_utils.load_movies()
+    index = movie_utils.catalog.index()
 
-    if genre:
-        movies = [m for m in movies if genre in m["metadata"]["movieGenres"]]
-    if min_rating is not None:
-        movies = [m for m in movies if m["metadata"]["movieIMDbRating"] >= min_rating]
-    if max_rating is not None:
-        movies = [m for m in movies if m["metadata"]["movieIMDbRating"] <= max_rating]
+    def build():
+        total, movies = index.query(
+            genre=genre,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            sort_by=sort_by,
+            order=order,
+            skip=skip,
+            limit=limit,
+        )
+        return schemas.MovieListResponse(movies=movies, total=total).model_dump(mode="json")
 
-    if sort_by == "rating":
-        movies.sort(key=lambda m: m["metadata"]["movieIMDbRating"], reverse=(order == "desc"))
-    elif sort_by == "date":
-        movies.sort(key=lambda m: m["metadata"]["datePublished"], reverse=(order == "desc"))
-
-    return {"movies": movies}
+    key = (index.version, genre, min_rating, max_rating, sort_by, order, skip, limit)
+    return movie_utils.movie_list_cache.response(key, build)
 
 @router.get("/{movie_id}", response_model=schemas.Movie)
 @movie_utils.movie_exists
@@ -40,64 +45,50 @@ def get_movie(movie_id: str, movie: dict):
 @movie_utils.movie_exists
 def add_to_watch_later(
     movie_id: str,
-    movie: dict,
     current_user=Depends(get_current_user)
 ):
     """Add movie to user's watch later list"""
-    users = auth_utils.load_users()
-    user = next((u for u in users if u['user_id'] == current_user.user_id), None)
-    
-    if not user:
+    if not auth_utils.get_user_by_id(current_user.user_id):
         raise HTTPException(status_code=404, detail="User not found")
     
-    if "watch_later" not in user:
-        user["watch_later"] = []
-    
-    if movie_id in user["watch_later"]:
+    if not movie_utils.add_to_watch_later(current_user.user_id, movie_id):
         raise HTTPException(status_code=400, detail="Movie already in watch later list")
     
-    user["watch_later"].append(movie_id)
-    auth_utils.save_users(users)
-    
     return {"message": "Movie added to watch later", "movie_id": movie_id}
 
 @router.delete("/{movie_id}/watch-later")
 @movie_utils.movie_exists
 def remove_from_watch_later(
     movie_id: str,
-    movie: dict,
     current_user=Depends(get_current_user)
 ):
     """Remove movie from user's watch later list"""
-    users = auth_utils.load_users()
-    user = next((u for u in users if u['user_id'] == current_user.user_id), None)
-    
-    if not user:
+    if not auth_utils.get_user_by_id(current_user.user_id):
         raise HTTPException(status_code=404, detail="User not found")
     
-    if "watch_later" not in user or movie_id not in user["watch_later"]:
+    if not movie_utils.remove_from_watch_later(current_user.user_id, movie_id):
         raise HTTPException(status_code=400, detail="Movie not in watch later list")
     
-    user["watch_later"].remove(movie_id)
-    auth_utils.save_users(users)
-    
     return {"message": "Movie removed from watch later", "movie_id": movie_id}
 
 @router.get("/user/watch-later", response_model=schemas.WatchLaterResponse)
-def get_watch_later(current_user=Depends(get_current_user)):
-    """Get user's watch later list with movie details"""
-    users = auth_utils.load_users()
-    user = next((u for u in users if u['user_id'] == current_user.user_id), None)
+async def get_watch_later(
+    current_user=Depends(get_current_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
+    """Get one page of the user's watch later list with movie details"""
+    user, movie_ids = await asyncio.gather(
+        loaders.users.load(current_user.user_id),
+        loaders.watch_later.load(current_user.user_id),
+    )
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    watch_later_movies = []
-    all_movies = movie_utils.load_movies()
-    
-    for movie_id in user.get("watch_later", []):
-        movie = next((m for m in all_movies if m["id"] == movie_id), None)
-        if movie:
-            watch_later_movies.append(movie)
+    # One catalog lookup for the whole page
+    movies = await loaders.movies.load_many(movie_ids[skip:skip + limit])
+    watch_later_movies = [movie for movie in movies if movie]
     
-    return {"watch_later": watch_later_movies}
\ No newline at end of file
+    return {"watch_later": watch_later_movies, "total": len(movie_ids)}
\ No newline at end of file
@@ -22,6 +22,8 @@ class Movie(BaseModel):
 
 class MovieListResponse(BaseModel):
     movies: List[Movie]
+    total: int
 
 class WatchLaterResponse(BaseModel):
-    watch_later: List[Movie]
\ No newline at end of file
+    watch_later: List[Movie]
+    total: int
\ No newline at end of file
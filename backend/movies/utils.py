@@ -1,45 +1,116 @@
-import json
-import csv
+import inspect
 import os
+import threading
 from pathlib import Path
-from datetime import datetime
 from functools import wraps
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Iterable, List, Optional
+from backend.authentication import utils as auth_utils
+from backend.movies.catalog import MovieCatalog
+from backend.movies.watch_later import WatchLaterStore
+from backend.serialization.responses import ResponseCache
+from backend.storage.utils import get_storage
 
 DATA_PATH = Path("backend/data/movieData")
+CATALOG_REVALIDATE_SECONDS = float(os.getenv("MOVIE_CATALOG_REVALIDATE_SECONDS", "1.0"))
+# Watch-later lists kept in memory per worker, least recently used evicted first
+WATCH_LATER_CACHE_SIZE = int(os.getenv("WATCH_LATER_CACHE_SIZE", "4096"))
+
+catalog = MovieCatalog(DATA_PATH, revalidate_interval=CATALOG_REVALIDATE_SECONDS)
+
+# Serialized GET /movies pages, keyed by catalog version and query
+movie_list_cache = ResponseCache(maxsize=int(os.getenv("MOVIE_LIST_CACHE_SIZE", "256")))
 
 def load_movies():
-    """Load all movies and their metadata from individual folders."""
-    movies = []
-    for movie_dir in DATA_PATH.iterdir():
-        if movie_dir.is_dir():
-            metadata_file = movie_dir / "metadata.json"
-            if metadata_file.exists():
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = json.load(f)
-                movies.append({
-                    "id": movie_dir.name,
-                    "metadata": metadata
-                })
-    return movies
+    """Load all movies and their metadata from the in-memory catalog."""
+    return catalog.all()
 
 def get_movie_by_id(movie_id: str):
     """Fetch a single movie's metadata by folder name."""
-    movie_dir = DATA_PATH / movie_id
-    metadata_file = movie_dir / "metadata.json"
+    return catalog.get(movie_id)
+
+def get_movies_by_ids(movie_ids: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+    """Fetch many movies in one pass over the id-keyed catalog; None for unknown ids, in input order."""
+    return catalog.get_many(movie_ids)
+
+# --- Watch later ---
+_watch_later: Optional[WatchLaterStore] = None
+_watch_later_lock = threading.Lock()
+
+def get_watch_later_store() -> WatchLaterStore:
+    global _watch_later
+    if _watch_later is None:
+        with _watch_later_lock:
+            if _watch_later is None:
+                _watch_later = WatchLaterStore(get_storage().watch_later, WATCH_LATER_CACHE_SIZE)
+    return _watch_later
+
+def migrate_watch_later() -> int:
+    """Move watch-later lists still kept in user records into the watch-later store.
 
-    if metadata_file.exists():
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            return {"id": movie_id, "metadata": json.load(f)}
-    return None
+    Run once at startup, before requests are served. A list already in the
+    store wins, so workers starting together never overwrite each other.
+    Returns how many users were moved.
+    """
+    collection = get_storage().watch_later
+    cleared = {}
+    for user in auth_utils.get_user_repository().all():
+        movie_ids = user.get("watch_later")
+        if not movie_ids:
+            continue
+        if collection.load(user["user_id"]) is None:
+            collection.save(user["user_id"], movie_ids)
+        cleared[user["user_id"]] = {"watch_later": []}
+    # One users.json rewrite for every migrated user, not one per user
+    if cleared:
+        auth_utils.update_users(cleared)
+    return len(cleared)
+
+def get_watch_later_ids(user_id: str) -> List[str]:
+    """A user's watch-later movie ids, oldest first"""
+    return get_watch_later_store().movie_ids(user_id)
+
+def add_to_watch_later(user_id: str, movie_id: str) -> bool:
+    """Add a movie to a user's watch-later list; False if already there"""
+    return get_watch_later_store().add(user_id, movie_id)
+
+def remove_from_watch_later(user_id: str, movie_id: str) -> bool:
+    """Remove a movie from a user's watch-later list; False if not there"""
+    return get_watch_later_store().remove(user_id, movie_id)
 
 # --- Decorators ---
 def movie_exists(func):
-    """Decorator to ensure a valid movie ID (folder) before calling the route."""
-    @wraps(func)
-    def wrapper(movie_id: str, *args, **kwargs):
-        movie = get_movie_by_id(movie_id)
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        return func(movie_id, *args, movie=movie, **kwargs)
+    """Decorator to ensure a valid movie ID (folder) before calling the route.
+
+    The check is a lookup in the catalog's in-memory id map, so unknown ids
+    never touch the disk. Routes that declare a ``movie`` parameter get the
+    movie dict; it is left out of the signature FastAPI sees, so it is
+    never read from the request. Works on sync and async routes.
+    """
+    signature = inspect.signature(func)
+    wants_movie = "movie" in signature.parameters
+
+    def lookup(movie_id: str) -> Dict[str, Any]:
+        if wants_movie:
+            movie = get_movie_by_id(movie_id)
+            if movie:
+                return {"movie": movie}
+        elif movie_id in catalog:
+            return {}
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            # The catalog may revalidate against disk, so look up off the event loop
+            extra = await run_in_threadpool(lookup, kwargs["movie_id"])
+            return await func(*args, **kwargs, **extra)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs, **lookup(kwargs["movie_id"]))
+    wrapper.__signature__ = signature.replace(
+        parameters=[parameter for parameter in signature.parameters.values() if parameter.name != "movie"]
+    )
     return wrapper
\ No newline at end of file
@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from backend.storage.base import WatchLaterCollection
+
+class WatchLaterStore:
+    """Users' watch-later lists as insertion-ordered sets (dicts with None values).
+
+    A user's list is loaded on first use and kept until the collection's
+    signature for that user changes; at most ``maxsize`` lists are kept,
+    least recently used first out. Users with no saved list have an empty
+    one. Each change saves only that user's list.
+    """
+
+    def __init__(self, collection: WatchLaterCollection, maxsize: int = 4096):
+        self.collection = collection
+        self.maxsize = maxsize
+        self._lists: "OrderedDict[str, Tuple[Optional[Hashable], Dict[str, None]]]" = OrderedDict()
+        self.lock = threading.RLock()
+
+    def movie_ids(self, user_id: str) -> List[str]:
+        with self.lock:
+            return list(self._list(user_id))
+
+    def add(self, user_id: str, movie_id: str) -> bool:
+        """Append a movie; False if it was already on the list."""
+        with self.lock:
+            movie_ids = self._list(user_id)
+            if movie_id in movie_ids:
+                return False
+            movie_ids[movie_id] = None
+            self._save(user_id, movie_ids)
+            return True
+
+    def remove(self, user_id: str, movie_id: str) -> bool:
+        """Remove a movie; False if it was not on the list."""
+        with self.lock:
+            movie_ids = self._list(user_id)
+            if movie_id not in movie_ids:
+                return False
+            del movie_ids[movie_id]
+            self._save(user_id, movie_ids)
+            return True
+
+    def _list(self, user_id: str) -> Dict[str, None]:
+        signature = self.collection.signature(user_id)
+        cached = self._lists.get(user_id)
+        if cached is not None and cached[0] == signature:
+            self._lists.move_to_end(user_id)
+            return cached[1]
+        movie_ids = dict.fromkeys(self.collection.load(user_id) or [])
+        self._cache(user_id, signature, movie_ids)
+        return movie_ids
+
+    def _save(self, user_id: str, movie_ids: Dict[str, None]) -> None:
+        self.collection.save(user_id, list(movie_ids))
+        self._cache(user_id, self.collection.signature(user_id), movie_ids)
+
+    def _cache(self, user_id: str, signature: Optional[Hashable], movie_ids: Dict[str, None]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._lists[user_id] = (signature, movie_ids)
+        self._lists.move_to_end(user_id)
+        while len(self._lists) > self.maxsize:
+            self._lists.popitem(last=False)
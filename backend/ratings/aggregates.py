@@ -0,0 +1,78 @@
+import math
+from typing import Dict, Optional
+
+# Histogram buckets are ratings rounded to the nearest whole point
+BUCKETS = 11
+
+class RatingAggregate:
+    """Running count, sum, sum of squares and histogram of one movie's ratings."""
+
+    __slots__ = ("count", "total", "total_sq", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.histogram = [0] * BUCKETS
+
+    def add(self, rating: float) -> None:
+        self.count += 1
+        self.total += rating
+        self.total_sq += rating * rating
+        self.histogram[_bucket(rating)] += 1
+
+    def remove(self, rating: float) -> None:
+        self.count -= 1
+        self.histogram[_bucket(rating)] -= 1
+        if self.count <= 0:
+            # Reset instead of subtracting so float error can't accumulate
+            self.count = 0
+            self.total = 0.0
+            self.total_sq = 0.0
+            return
+        self.total -= rating
+        self.total_sq -= rating * rating
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """Population standard deviation."""
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+    @property
+    def distribution(self) -> Dict[str, int]:
+        return {str(bucket): count for bucket, count in enumerate(self.histogram)}
+
+class RatingAggregates:
+    """Per-movie rating aggregates, updated in O(1) per rating change."""
+
+    def __init__(self):
+        self._by_movie: Dict[str, RatingAggregate] = {}
+
+    def get(self, movie_id: str) -> RatingAggregate:
+        return self._by_movie.get(movie_id) or RatingAggregate()
+
+    def add(self, movie_id: str, rating: float) -> None:
+        self._by_movie.setdefault(movie_id, RatingAggregate()).add(rating)
+
+    def remove(self, movie_id: str, rating: float) -> None:
+        aggregate = self._by_movie.get(movie_id)
+        if aggregate is None:
+            return
+        aggregate.remove(rating)
+        if not aggregate.count:
+            del self._by_movie[movie_id]
+
+    def replace(self, movie_id: str, old: Optional[float], new: float) -> None:
+        if old is not None:
+            self.remove(movie_id, old)
+        self.add(movie_id, new)
+
+def _bucket(rating: float) -> int:
+    return min(max(int(rating + 0.5), 0), BUCKETS - 1)
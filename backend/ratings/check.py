@@ -0,0 +1,28 @@
+"""Consistency check for the ratings store.
+
+Usage: python -m backend.ratings.check
+
+Reads the ratings straight from disk (the snapshot plus the log replayed on top)
+and verifies the in-memory store's user-major map, movie-major index and
+per-movie aggregates agree with them. Exits non-zero if any problem is found.
+"""
+import sys
+
+from backend.ratings import utils as ratings_utils
+
+def main() -> int:
+    store = ratings_utils.get_ratings_store()
+    problems = ratings_utils.check_consistency()
+    ratings_count = sum(len(user_ratings) for user_ratings in store.by_user.values())
+    print(f"{ratings_count} ratings, {len(store.by_user)} users, {len(store.by_movie)} movies")
+
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        print(f"{len(problems)} problem(s) found")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
 from backend.ratings import schemas
 from backend.ratings import utils as ratings_utils
 from backend.movies import utils as movies_utils
 from backend.authentication.security import get_current_user
 from backend.authentication import utils as auth_utils
+from backend.dataloader.utils import RequestLoaders, get_loaders
 
 router = APIRouter(prefix="/ratings", tags=["ratings"])
 
@@ -27,7 +30,6 @@ def rate_movie(
 @movies_utils.movie_exists
 def remove_rating(
     movie_id: str,
-    movie: dict,
     current_user=Depends(get_current_user)
 ):
     """Remove user's rating for a movie"""
@@ -39,40 +41,52 @@ def remove_rating(
     return {"message": "Rating removed successfully", "movie_id": movie_id}
 
 @router.get("/user", response_model=schemas.UserRatingsResponse)
-def get_user_ratings(current_user=Depends(get_current_user)):
-    """Get all movies rated by user with details"""
-    user_ratings = ratings_utils.get_user_ratings(current_user.user_id)
-    all_movies = movies_utils.load_movies()
+async def get_user_ratings(
+    current_user=Depends(get_current_user),
+    sort_by: Optional[str] = Query(None, enum=["rating", "rated_at"]),
+    order: Optional[str] = Query("desc", enum=["asc", "desc"]),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
+    """Get one page of the movies rated by user with details"""
+    # Ratings of movies no longer in the catalog count towards neither the total nor the page
+    total, entries = await run_in_threadpool(
+        ratings_utils.get_user_rating_history, current_user.user_id, sort_by, order, skip, limit,
+        lambda movie_id: movie_id in movies_utils.catalog
+    )
+    # One catalog lookup for the whole page
+    movies = await loaders.movies.load_many(movie_id for movie_id, _, _ in entries)
     
     rated_movies = []
-    for movie_id, rating in user_ratings.items():
-        movie = next((m for m in all_movies if m["id"] == movie_id), None)
+    for (movie_id, rating, rated_at), movie in zip(entries, movies):
         if movie:
             rated_movies.append({
                 "movie": movie,
-                "user_rating": rating
+                "user_rating": rating,
+                "rated_at": rated_at
             })
     
-    return {"ratings": rated_movies}
+    return {"ratings": rated_movies, "total": total}
 
 @router.get("/{movie_id}/average", response_model=schemas.AverageRatingResponse)
 @movies_utils.movie_exists
 def get_movie_average_rating(movie_id: str):
-    """Get average rating for a movie"""
-    avg_rating = ratings_utils.get_average_rating(movie_id)
-    movie_ratings = ratings_utils.get_movie_ratings(movie_id)
+    """Get average rating, spread and distribution for a movie"""
+    aggregate = ratings_utils.get_rating_aggregate(movie_id)
     
     return {
         "movie_id": movie_id,
-        "average_rating": avg_rating,
-        "total_ratings": len(movie_ratings)
+        "average_rating": aggregate.average,
+        "total_ratings": aggregate.count,
+        "std_dev": aggregate.std_dev,
+        "distribution": aggregate.distribution
     }
 
 @router.get("/{movie_id}/user")
 @movies_utils.movie_exists
 def get_user_rating_for_movie(
     movie_id: str,
-    movie: dict,
     current_user=Depends(get_current_user)
 ):
     """Get current user's rating for a specific movie"""
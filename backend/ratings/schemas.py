@@ -8,14 +8,18 @@ class RatingCreate(BaseModel):
 class UserRatingResponse(BaseModel):
     movie: Movie
     user_rating: float
+    rated_at: Optional[str] = None
 
 class UserRatingsResponse(BaseModel):
     ratings: List[UserRatingResponse]
+    total: int
 
 class AverageRatingResponse(BaseModel):
     movie_id: str
     average_rating: Optional[float]
     total_ratings: int
+    std_dev: Optional[float] = None
+    distribution: Dict[str, int] = {}  # rating rounded to whole points -> count
 
 class MovieRatingsResponse(BaseModel):
     movie_id: str
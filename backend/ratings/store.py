@@ -0,0 +1,141 @@
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.ratings.aggregates import RatingAggregate, RatingAggregates
+
+class RatingsStore:
+    """In-memory ratings kept both user-major and movie-major.
+
+    ``by_user`` mirrors ratings.json ({user_id: {movie_id: rating}});
+    ``by_movie`` is the inverse ({movie_id: {user_id: rating}}) and the
+    per-movie aggregates are derived from it. ``rated_at`` has the same
+    shape as ``by_user`` and holds when each rating was set, where known.
+    Every write goes through ``set``/``delete`` so they stay consistent.
+    """
+
+    def __init__(
+        self,
+        by_user: Optional[Dict[str, Dict[str, float]]] = None,
+        rated_at: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        self.by_user: Dict[str, Dict[str, float]] = {}
+        self.by_movie: Dict[str, Dict[str, float]] = {}
+        self.rated_at: Dict[str, Dict[str, str]] = {}
+        self.aggregates = RatingAggregates()
+        self.lock = threading.RLock()
+        rated_at = rated_at or {}
+        for user_id, user_ratings in (by_user or {}).items():
+            user_rated_at = rated_at.get(user_id, {})
+            for movie_id, rating in user_ratings.items():
+                self.set(user_id, movie_id, rating, user_rated_at.get(movie_id))
+
+    def user_ratings(self, user_id: str) -> Dict[str, float]:
+        return dict(self.by_user.get(user_id, {}))
+
+    def movie_ratings(self, movie_id: str) -> Dict[str, float]:
+        return dict(self.by_movie.get(movie_id, {}))
+
+    def aggregate(self, movie_id: str) -> RatingAggregate:
+        return self.aggregates.get(movie_id)
+
+    def user_history(
+        self,
+        user_id: str,
+        sort_by: Optional[str] = None,
+        order: str = "desc",
+        skip: int = 0,
+        limit: Optional[int] = None,
+        keep: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[int, List[Tuple[str, float, Optional[str]]]]:
+        """The total and one page of a user's (movie_id, rating, rated_at) entries.
+
+        ``sort_by`` is "rating" or "rated_at"; None keeps the order ratings
+        were first made. Ratings with no recorded date sort after the rest.
+        Movies ``keep`` rejects are left out of both the total and the page.
+        """
+        with self.lock:
+            user_rated_at = self.rated_at.get(user_id, {})
+            entries = [
+                (movie_id, rating, user_rated_at.get(movie_id))
+                for movie_id, rating in self.by_user.get(user_id, {}).items()
+            ]
+        if keep is not None:
+            entries = [entry for entry in entries if keep(entry[0])]
+        if sort_by == "rating":
+            entries.sort(key=lambda entry: entry[1], reverse=order == "desc")
+        elif sort_by == "rated_at":
+            undated = [entry for entry in entries if entry[2] is None]
+            entries = sorted((entry for entry in entries if entry[2] is not None), key=lambda entry: entry[2], reverse=order == "desc")
+            entries.extend(undated)
+        end = None if limit is None else skip + limit
+        return len(entries), entries[skip:end]
+
+    def set(self, user_id: str, movie_id: str, rating: float, rated_at: Optional[str] = None) -> Optional[float]:
+        """Set a rating, returning the one it replaced."""
+        with self.lock:
+            previous = self.by_user.setdefault(user_id, {}).get(movie_id)
+            self.by_user[user_id][movie_id] = rating
+            self.by_movie.setdefault(movie_id, {})[user_id] = rating
+            if rated_at is not None:
+                self.rated_at.setdefault(user_id, {})[movie_id] = rated_at
+            else:
+                self._forget_rated_at(user_id, movie_id)
+            self.aggregates.replace(movie_id, previous, rating)
+            return previous
+
+    def delete(self, user_id: str, movie_id: str) -> Optional[float]:
+        """Delete a rating, returning it, or None if there was none."""
+        with self.lock:
+            user_ratings = self.by_user.get(user_id)
+            if not user_ratings or movie_id not in user_ratings:
+                return None
+            previous = user_ratings.pop(movie_id)
+            if not user_ratings:
+                del self.by_user[user_id]
+            self._forget_rated_at(user_id, movie_id)
+            movie_ratings = self.by_movie[movie_id]
+            del movie_ratings[user_id]
+            if not movie_ratings:
+                del self.by_movie[movie_id]
+            self.aggregates.remove(movie_id, previous)
+            return previous
+
+    def check_consistency(self, on_disk: Dict[str, Dict[str, float]]) -> List[str]:
+        """Compare the user-major map, movie-major index and aggregates against ratings read from disk."""
+        problems = []
+        expected = RatingsStore(on_disk)
+        with self.lock:
+            for user_id in sorted(set(expected.by_user) | set(self.by_user)):
+                want = expected.by_user.get(user_id, {})
+                have = self.by_user.get(user_id, {})
+                for movie_id in sorted(set(want) | set(have)):
+                    if want.get(movie_id) != have.get(movie_id):
+                        problems.append(
+                            f"{user_id}/{movie_id}: disk has {want.get(movie_id)}, user-major has {have.get(movie_id)}"
+                        )
+
+            for movie_id in sorted(set(expected.by_movie) | set(self.by_movie)):
+                want = expected.by_movie.get(movie_id, {})
+                have = self.by_movie.get(movie_id, {})
+                for user_id in sorted(set(want) | set(have)):
+                    if want.get(user_id) != have.get(user_id):
+                        problems.append(
+                            f"{movie_id}/{user_id}: disk has {want.get(user_id)}, movie-major has {have.get(user_id)}"
+                        )
+
+                want_agg, have_agg = expected.aggregate(movie_id), self.aggregate(movie_id)
+                if want_agg.count != have_agg.count or want_agg.histogram != have_agg.histogram:
+                    problems.append(f"{movie_id}: aggregate count/histogram out of date")
+                elif want_agg.count and abs(want_agg.total - have_agg.total) > 1e-6 * want_agg.count:
+                    problems.append(f"{movie_id}: aggregate sum out of date")
+
+        for user_id, user_ratings in on_disk.items():
+            for movie_id, rating in user_ratings.items():
+                if not isinstance(rating, (int, float)) or not 0.0 <= rating <= 10.0:
+                    problems.append(f"{user_id}/{movie_id}: invalid rating {rating!r}")
+        return problems
+
+    def _forget_rated_at(self, user_id: str, movie_id: str) -> None:
+        user_rated_at = self.rated_at.get(user_id)
+        if user_rated_at and user_rated_at.pop(movie_id, None) is not None and not user_rated_at:
+            del self.rated_at[user_id]
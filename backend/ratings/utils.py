@@ -1,70 +1,149 @@
-import json
-import os
-from typing import Dict, List, Optional
-from pathlib import Path
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Hashable, Tuple
+from backend.ratings.aggregates import RatingAggregate
+from backend.ratings.store import RatingsStore
+from backend.storage.utils import get_storage
 
-RATINGS_FILE = Path("backend/data/ratings.json")
+_store: Optional[RatingsStore] = None
+_store_source: Optional[Hashable] = None
+# Held across every write and reload so a reload never reads a half-written file
+_store_lock = threading.RLock()
 
 def load_ratings() -> Dict[str, Dict[str, float]]:
-    """Load all user ratings: {user_id: {movie_id: rating}}"""
-    if not RATINGS_FILE.exists():
-        return {}
-    
-    with open(RATINGS_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+    """Load all user ratings: {user_id: {movie_id: rating}}
+
+    With the JSON backend this reads the ratings.json snapshot and replays the
+    ratings log on top of it.
+    """
+    return get_storage().ratings.load()
 
 def save_ratings(ratings: Dict[str, Dict[str, float]]) -> None:
-    RATINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(RATINGS_FILE, "w") as f:
-        json.dump(ratings, f, indent=4)
+    """Replace every rating; prefer set_user_rating/delete_user_rating for single changes."""
+    global _store, _store_source
+    with _store_lock:
+        storage_ratings = get_storage().ratings
+        storage_ratings.replace_all(ratings)
+        _store_source = storage_ratings.signature()
+        _store = RatingsStore({user_id: dict(user_ratings) for user_id, user_ratings in ratings.items()})
+
+def get_ratings_store() -> RatingsStore:
+    """The in-memory ratings store, brought up to date if ratings changed outside this module.
+
+    Changes other processes appended are applied in place when the backend
+    can list them (``read_since``); otherwise the store is rebuilt.
+    """
+    global _store, _store_source
+    ratings = get_storage().ratings
+    source = ratings.signature()
+    if _store is not None and source == _store_source:
+        return _store
+    with _store_lock:
+        if _store is None or ratings.signature() != _store_source:
+            changes = ratings.read_since(_store_source) if _store is not None else None
+            if changes is None:
+                by_user, rated_at, _store_source = ratings.load_state()
+                _store = RatingsStore(by_user, rated_at)
+            else:
+                records, _store_source = changes
+                for record in records:
+                    _apply(_store, record)
+        return _store
 
 def get_user_ratings(user_id: str) -> Dict[str, float]:
     """Get all ratings for a specific user"""
-    ratings = load_ratings()
-    return ratings.get(user_id, {})
+    return get_ratings_store().user_ratings(user_id)
+
+def get_user_rating_history(
+    user_id: str,
+    sort_by: Optional[str] = None,
+    order: str = "desc",
+    skip: int = 0,
+    limit: Optional[int] = None,
+    keep: Optional[Callable[[str], bool]] = None
+) -> Tuple[int, List[Tuple[str, float, Optional[str]]]]:
+    """Total and one page of a user's (movie_id, rating, rated_at), optionally sorted by rating or rated_at
+
+    Movies ``keep`` rejects are left out before counting and paging.
+    """
+    return get_ratings_store().user_history(user_id, sort_by, order, skip, limit, keep)
 
 def get_movie_ratings(movie_id: str) -> Dict[str, float]:
-    """Get all ratings for a specific movie"""
-    all_ratings = load_ratings()
-    movie_ratings = {}
-    
-    for user_id, user_ratings in all_ratings.items():
-        if movie_id in user_ratings:
-            movie_ratings[user_id] = user_ratings[movie_id]
-    
-    return movie_ratings
+    """Get all ratings for a specific movie from the movie-major index"""
+    return get_ratings_store().movie_ratings(movie_id)
+
+def get_rating_aggregate(movie_id: str) -> RatingAggregate:
+    """Count, sum, sum of squares and histogram of a movie's ratings"""
+    return get_ratings_store().aggregate(movie_id)
 
 def get_average_rating(movie_id: str) -> Optional[float]:
-    """Calculate average rating for a movie"""
-    movie_ratings = get_movie_ratings(movie_id)
-    if not movie_ratings:
-        return None
-    
-    return sum(movie_ratings.values()) / len(movie_ratings)
+    """Average rating for a movie, read from its aggregate"""
+    return get_rating_aggregate(movie_id).average
 
 def set_user_rating(user_id: str, movie_id: str, rating: float) -> None:
     """Set or update a user's rating for a movie"""
-    ratings = load_ratings()
-    
-    if user_id not in ratings:
-        ratings[user_id] = {}
-    
-    ratings[user_id][movie_id] = rating
-    save_ratings(ratings)
+    with _store_lock:
+        store = get_ratings_store()
+        now = _now()
+        store.set(user_id, movie_id, rating, now)
+        ticket = _write({"op": "set", "user": user_id, "movie": movie_id, "rating": rating, "ts": now})
+    _commit(ticket)
 
 def delete_user_rating(user_id: str, movie_id: str) -> bool:
     """Remove a user's rating for a movie"""
-    ratings = load_ratings()
-    
-    if user_id in ratings and movie_id in ratings[user_id]:
-        del ratings[user_id][movie_id]
-        # Remove user entry if no ratings left
-        if not ratings[user_id]:
-            del ratings[user_id]
-        save_ratings(ratings)
-        return True
-    
-    return False
\ No newline at end of file
+    with _store_lock:
+        store = get_ratings_store()
+        if store.delete(user_id, movie_id) is None:
+            return False
+        ticket = _write({"op": "delete", "user": user_id, "movie": movie_id, "ts": _now()})
+    _commit(ticket)
+    return True
+
+def compact_ratings() -> None:
+    """Fold pending rating changes into the backend's snapshot (ratings.json for the JSON backend).
+
+    The snapshot is rebuilt from what is on disk, so changes other processes
+    appended are kept.
+    """
+    global _store_source
+    with _store_lock:
+        get_ratings_store()
+        # None if another process wrote meanwhile; the next read then reloads
+        _store_source = get_storage().ratings.compact(_store_source)
+
+def check_consistency() -> List[str]:
+    """Problems found between the in-memory store and the ratings on disk (snapshot plus log)"""
+    ratings = get_storage().ratings
+    with _store_lock:
+        while True:
+            on_disk, _, source = ratings.load_state()
+            store = get_ratings_store()
+            # Another process may write between the two reads; compare like with like
+            if source == _store_source:
+                return store.check_consistency(on_disk)
+
+def _write(record: Dict[str, Any]) -> int:
+    # Called with _store_lock held, after applying the record to the store
+    global _store_source
+    ratings = get_storage().ratings
+    ticket = ratings.write(record)
+    _store_source = ratings.advance(_store_source)
+    return ticket
+
+def _apply(store: RatingsStore, record: Dict[str, Any]) -> None:
+    if record["op"] == "set":
+        store.set(record["user"], record["movie"], record["rating"], record.get("ts"))
+    else:
+        store.delete(record["user"], record["movie"])
+
+def _commit(ticket: int) -> None:
+    # Wait outside the store lock so concurrent writers share one fsync
+    ratings = get_storage().ratings
+    ratings.wait(ticket)
+    if ratings.needs_compaction():
+        with _store_lock:
+            if ratings.needs_compaction():
+                compact_ratings()
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,219 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from backend.serialization.utils import dumps, loads
+from backend.storage.persistence import process_lock
+
+class RatingsLog:
+    """Append-only log of rating changes with group commit.
+
+    ``write`` appends a record to the log file and returns a ticket; ``wait``
+    blocks until that ticket is durable. The first waiter becomes the leader:
+    it holds the commit open for ``commit_delay`` seconds so concurrent
+    writers can join, then fsyncs once for the whole group.
+
+    Several processes may share one log. Each record is appended with a
+    single write under an exclusive flock on ``lock_path``, so readers
+    holding the shared lock only ever see whole records, and ``truncate``
+    (called with the exclusive lock held) never drops a record it was not
+    shown.
+    """
+
+    def __init__(self, path: Path, commit_delay: float = 0.002, fsync: bool = True):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self.commit_delay = commit_delay
+        self.fsync = fsync
+        # (inode, start offset, end offset) of this process's latest append
+        self.last_append: Optional[Tuple[int, int, int]] = None
+        self._fd: Optional[int] = None
+        self._ino: Optional[int] = None
+        # (inode, offset, records before offset) for ``pending``
+        self._counted: Tuple[Optional[int], int, int] = (None, 0, 0)
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._cond = threading.Condition()
+
+    def lock(self, exclusive: bool = True) -> ContextManager[None]:
+        """The inter-process lock guarding the log (shared for readers)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return process_lock(self.lock_path, exclusive)
+
+    def read(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Complete records from ``offset`` on, and the offset just past what was read.
+
+        Call with ``lock(exclusive=False)`` held. A torn line (a crash
+        mid-append) is skipped.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(loads(line))
+            except ValueError:
+                continue
+        return records, offset + len(data)
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Yield every complete record in the log, in order."""
+        with self.lock(exclusive=False):
+            records, _ = self.read()
+        return iter(records)
+
+    def stat(self) -> Optional[Tuple[int, int]]:
+        """(inode, size) of the log file, or None if there is none yet."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size
+
+    def pending(self) -> int:
+        """Roughly how many records the log holds, counting every process's appends."""
+        with self._cond:
+            current = self.stat()
+            if current is None:
+                return 0
+            ino, size = current
+            counted_ino, offset, count = self._counted
+            if ino != counted_ino or size < offset:
+                offset, count = 0, 0
+            if size > offset:
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(size - offset)
+                count += data.count(b"\n")
+                offset += len(data)
+            self._counted = (ino, offset, count)
+            return count
+
+    def write(self, record: Dict[str, Any]) -> int:
+        """Append a record for the next group commit and return its ticket."""
+        line = dumps(record) + b"\n"
+        # The flock is taken before the condition, the same order as truncate's callers
+        with self.lock(), self._cond:
+            self._open()
+            end = self._append(line)
+            self.last_append = (self._ino, end - len(line), end)
+            self._written += 1
+            return self._written
+
+    def wait(self, ticket: int) -> None:
+        """Block until the record with ``ticket`` has been fsynced."""
+        with self._cond:
+            while self._synced < ticket:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                try:
+                    self._cond.release()
+                    try:
+                        time.sleep(self.commit_delay)
+                    finally:
+                        self._cond.acquire()
+                    self._commit()
+                finally:
+                    self._syncing = False
+                    self._cond.notify_all()
+
+    def sync(self) -> None:
+        """Make everything written so far durable."""
+        with self._cond:
+            ticket = self._written
+        self.wait(ticket)
+
+    def truncate(self) -> None:
+        """Empty the log once its records are covered by a snapshot.
+
+        Call with ``lock()`` held, after reading the log under it. Other
+        processes keep appending to the same (now empty) file.
+        """
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            self._open()
+            os.ftruncate(self._fd, 0)
+            if self.fsync:
+                os.fsync(self._fd)
+            self._synced = self._written
+            self._counted = (self._ino, 0, 0)
+
+    def close(self) -> None:
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            if self._fd is not None:
+                if self.fsync:
+                    os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+                self._synced = self._written
+
+    def _open(self) -> None:
+        # Called with the flock and the condition held
+        current = self.stat()
+        if self._fd is not None and current is not None and current[0] == self._ino:
+            return
+        if self._fd is not None:
+            # The file was removed or replaced; make what we wrote to it durable first
+            while self._syncing:
+                self._cond.wait()
+            if self.fsync:
+                os.fsync(self._fd)
+            os.close(self._fd)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        st = os.fstat(self._fd)
+        self._ino = st.st_ino
+        if st.st_size and os.pread(self._fd, 1, st.st_size - 1) != b"\n":
+            # A crash left a torn record; end it so the next record starts on its own line
+            os.write(self._fd, b"\n")
+
+    def _append(self, data: bytes) -> int:
+        os.write(self._fd, data)
+        return os.lseek(self._fd, 0, os.SEEK_CUR)
+
+    def _commit(self) -> None:
+        # Called with the condition held; fsync outside it so writers keep appending
+        target = self._written
+        if self._fd is not None:
+            fd = self._fd
+            self._cond.release()
+            try:
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                self._cond.acquire()
+        self._synced = max(self._synced, target)
+
+def apply_record(ratings: Dict[str, Dict[str, float]], record: Dict[str, Any]) -> None:
+    """Apply one log record to a {user_id: {movie_id: rating}} map."""
+    user_id, movie_id = record["user"], record["movie"]
+    if record["op"] == "set":
+        ratings.setdefault(user_id, {})[movie_id] = record["rating"]
+    elif record["op"] == "delete":
+        user_ratings = ratings.get(user_id)
+        if user_ratings and movie_id in user_ratings:
+            del user_ratings[movie_id]
+            if not user_ratings:
+                del ratings[user_id]
+
+def apply_rated_at(rated_at: Dict[str, Dict[str, str]], record: Dict[str, Any]) -> None:
+    """Apply one log record to a {user_id: {movie_id: timestamp}} map."""
+    user_rated_at = rated_at.setdefault(record["user"], {})
+    if record["op"] == "set" and record.get("ts"):
+        user_rated_at[record["movie"]] = record["ts"]
+    else:
+        user_rated_at.pop(record["movie"], None)
+    if not user_rated_at:
+        del rated_at[record["user"]]
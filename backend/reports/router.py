@@ -15,14 +15,7 @@ def get_pending_reports(
     limit: int = Query(50, ge=1, le=100)
 ):
     """Get reports - moderators can filter by status"""
-    all_reports = report_utils.load_reports()
-    
-    if status:
-        filtered_reports = [r for r in all_reports if r["status"] == status]
-    else:
-        filtered_reports = all_reports
-    
-    return filtered_reports[:limit]
+    return report_utils.get_reports(status, limit)
 
 @router.get("/{report_id}", response_model=schemas.ReportResponse)
 @dashboard_utils.require_role(UserRole.MODERATOR)
@@ -52,9 +45,9 @@ def dismiss_report(
     if report["status"] != "pending":
         raise HTTPException(status_code=400, detail="Report already processed")
     
-    success = report_utils.dismiss_report(report_id, current_user.user_id, notes)
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to dismiss report")
+    # Only succeeds if no other moderator resolved the report in the meantime
+    if not report_utils.dismiss_report(report_id, current_user.user_id, notes):
+        raise HTTPException(status_code=400, detail="Report already processed")
     
     return {"message": "Report dismissed successfully", "report_id": report_id}
 
@@ -77,14 +70,24 @@ def apply_penalty_from_report(
     # For now, we'll assume the report is about a review from a specific user
     # You might need to adjust this based on your reporting logic
     from backend.authentication import utils as auth_utils
-    users = auth_utils.load_users()
     
     # Find the user who should be penalized (this might need to be stored in the report)
     # For now, we'll use the penalty_data.user_id provided by moderator
-    target_user = next((u for u in users if u["user_id"] == penalty_data.user_id), None)
+    target_user = auth_utils.get_user_by_id(penalty_data.user_id)
     if not target_user:
         raise HTTPException(status_code=404, detail="User to penalize not found")
     
+    # Claim the report first so two moderators can't both penalize for it
+    claimed = report_utils.update_report_status(
+        report_id=report_id,
+        status="penalty_applied",
+        moderator_id=current_user.user_id,
+        notes=f"Penalty applied: {penalty_data.severity} severity, {penalty_data.duration_days} days",
+        expected_status="pending"
+    )
+    if not claimed:
+        raise HTTPException(status_code=400, detail="Report already processed")
+    
     # Apply the penalty
     penalty = report_utils.apply_penalty_to_user(
         user_id=penalty_data.user_id,
@@ -94,14 +97,6 @@ def apply_penalty_from_report(
         report_id=report_id
     )
     
-    # Update report status
-    report_utils.update_report_status(
-        report_id=report_id,
-        status="penalty_applied",
-        moderator_id=current_user.user_id,
-        notes=f"Penalty applied: {penalty_data.severity} severity, {penalty_data.duration_days} days"
-    )
-    
     return {
         "message": "Penalty applied successfully",
         "report_id": report_id,
@@ -0,0 +1,51 @@
+import copy
+import threading
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, List
+
+REPORT_STATUSES = ("pending", "dismissed", "penalty_applied")
+
+class ModerationStats:
+    """Report counters, maintained as reports change.
+
+    Holds per-status report counts and the pending reports in creation order,
+    so the moderator dashboard never scans reports.json. Penalties are counted
+    by ``ReportStore``, which already indexes them.
+    """
+
+    def __init__(self, reports: Iterable[Dict[str, Any]] = ()):
+        self.status_counts: Counter = Counter()
+        self.total_reports = 0
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        for report in reports:
+            self.report_added(report)
+
+    def report_added(self, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self.total_reports += 1
+            self.status_counts[report["status"]] += 1
+            if report["status"] == "pending":
+                self.pending[report["report_id"]] = copy.deepcopy(report)
+
+    def report_updated(self, old_status: str, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self.status_counts[old_status] -= 1
+            self.status_counts[report["status"]] += 1
+            if report["status"] == "pending":
+                self.pending[report["report_id"]] = copy.deepcopy(report)
+            else:
+                self.pending.pop(report["report_id"], None)
+
+    def pending_reports(self, limit: int) -> List[Dict[str, Any]]:
+        """The oldest ``limit`` pending reports."""
+        with self._lock:
+            return copy.deepcopy(list(islice(self.pending.values(), limit)))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "total_reports": self.total_reports,
+                **{status: self.status_counts[status] for status in REPORT_STATUSES},
+            }
@@ -0,0 +1,118 @@
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.reports.stats import ModerationStats
+
+def _next_number(ids: Iterable[str], prefix: str) -> int:
+    """One past the highest ``<prefix>_<n>`` id, so ids are never reused."""
+    highest = 0
+    for record_id in ids:
+        number = record_id[len(prefix) + 1:]
+        if record_id.startswith(prefix + "_") and number.isdigit():
+            highest = max(highest, int(number))
+    return highest + 1
+
+class ReportStore:
+    """Reports and penalties indexed for the moderation routes.
+
+    ``reports`` and ``penalties`` map ids to records in creation order,
+    ``report_ids_by_status`` and ``penalty_ids_by_user`` are ordered id sets
+    (dicts with None values) over them, and ``stats`` holds the dashboard
+    counters. Every write goes through the methods below so they stay
+    consistent. Ids come from counters that only move forward.
+    ``active_penalty_count`` is kept as penalties are indexed.
+    """
+
+    def __init__(self, reports: Iterable[Dict[str, Any]] = (), penalties: Iterable[Dict[str, Any]] = ()):
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.report_ids_by_status: Dict[str, Dict[str, None]] = {}
+        self.penalties: Dict[str, Dict[str, Any]] = {}
+        self.penalty_ids_by_user: Dict[str, Dict[str, None]] = {}
+        self.active_penalty_count = 0
+        self.lock = threading.RLock()
+        for report in reports:
+            self._index_report(dict(report))
+        for penalty in penalties:
+            self._index_penalty(dict(penalty))
+        self.stats = ModerationStats(self.reports.values())
+        self._next_report = _next_number(self.reports, "report")
+        self._next_penalty = _next_number(self.penalties, "penalty")
+
+    def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            report = self.reports.get(report_id)
+            return dict(report) if report else None
+
+    def list_reports(self, status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Reports in creation order, optionally only those with ``status``."""
+        with self.lock:
+            if status is None:
+                reports: Iterable[Dict[str, Any]] = self.reports.values()
+            else:
+                reports = (self.reports[report_id] for report_id in self.report_ids_by_status.get(status, {}))
+            return [dict(report) for report in islice(reports, limit)]
+
+    def add_report(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a new report under the next id and return it."""
+        with self.lock:
+            report = {"report_id": f"report_{self._next_report}", **fields}
+            self._next_report += 1
+            self._index_report(report)
+            self.stats.report_added(report)
+            return dict(report)
+
+    def update_report(self, report_id: str, changes: Dict[str, Any], expected_status: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Apply ``changes`` to a report and return it.
+
+        Returns None if there is no such report, or if ``expected_status`` is
+        given and the report is no longer in it.
+        """
+        with self.lock:
+            report = self.reports.get(report_id)
+            if report is None or (expected_status is not None and report["status"] != expected_status):
+                return None
+            old_status = report["status"]
+            report.update(changes)
+            if report["status"] != old_status:
+                del self.report_ids_by_status[old_status][report_id]
+                self.report_ids_by_status.setdefault(report["status"], {})[report_id] = None
+            self.stats.report_updated(old_status, report)
+            return dict(report)
+
+    def add_penalty(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a new penalty under the next id and return it."""
+        with self.lock:
+            penalty = {"penalty_id": f"penalty_{self._next_penalty}", **fields}
+            self._next_penalty += 1
+            self._index_penalty(penalty)
+            return dict(penalty)
+
+    def user_penalties(self, user_id: str, active_only: bool = False) -> List[Dict[str, Any]]:
+        """A user's penalties, oldest first."""
+        with self.lock:
+            penalties = (self.penalties[penalty_id] for penalty_id in self.penalty_ids_by_user.get(user_id, {}))
+            return [dict(penalty) for penalty in penalties if penalty.get("active") or not active_only]
+
+    def counts(self) -> Dict[str, int]:
+        """Active penalties and report counts by status, for the moderator dashboard."""
+        with self.lock:
+            return {"active_penalties": self.active_penalty_count, **self.stats.counts()}
+
+    def report_records(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.reports.values())
+
+    def penalty_records(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.penalties.values())
+
+    def _index_report(self, report: Dict[str, Any]) -> None:
+        self.reports[report["report_id"]] = report
+        self.report_ids_by_status.setdefault(report["status"], {})[report["report_id"]] = None
+
+    def _index_penalty(self, penalty: Dict[str, Any]) -> None:
+        self.penalties[penalty["penalty_id"]] = penalty
+        self.penalty_ids_by_user.setdefault(penalty["user_id"], {})[penalty["penalty_id"]] = None
+        if penalty.get("active"):
+            self.active_penalty_count += 1
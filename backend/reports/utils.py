@@ -1,116 +1,137 @@
-import json
-import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from typing import List, Dict, Any, Optional, Hashable, Tuple
+from backend.reports.stats import ModerationStats
+from backend.reports.store import ReportStore
+from backend.storage.utils import get_storage
 
-REPORTS_FILE = Path("backend/data/reports.json")
-PENALTIES_FILE = Path("backend/data/penalties.json")
+_store: Optional[ReportStore] = None
+_store_source: Optional[Tuple[Hashable, Hashable]] = None
+# Held across every write and reload so a reload never sees a half-applied change
+_store_lock = threading.RLock()
+
+def _sources() -> Tuple[Hashable, Hashable]:
+    storage = get_storage()
+    return storage.reports.signature(), storage.penalties.signature()
+
+def get_report_store() -> ReportStore:
+    """The indexed report and penalty store, rebuilt only if the data changed outside this module.
+
+    Writes made here update the store in place; the collection signatures ignore them.
+    """
+    global _store, _store_source
+    if _store is not None and _sources() == _store_source:
+        return _store
+    with _store_lock:
+        if _store is None or _sources() != _store_source:
+            _store_source = _sources()
+            _store = ReportStore(load_reports(), load_penalties())
+        return _store
+
+def get_moderation_stats() -> ModerationStats:
+    """Report counters and pending reports for the moderator dashboard"""
+    return get_report_store().stats
 
 def load_reports() -> List[Dict[str, Any]]:
-    if not REPORTS_FILE.exists():
-        return []
-    
-    with open(REPORTS_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return []
+    return get_storage().reports.load()
 
 def save_reports(reports: List[Dict[str, Any]]) -> None:
-    REPORTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(REPORTS_FILE, "w") as f:
-        json.dump(reports, f, indent=4)
+    """Replace every report; the store is rebuilt on next use."""
+    global _store
+    with _store_lock:
+        get_storage().reports.save(reports)
+        _store = None
 
 def load_penalties() -> List[Dict[str, Any]]:
-    if not PENALTIES_FILE.exists():
-        return []
-    
-    with open(PENALTIES_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return []
+    return get_storage().penalties.load()
 
 def save_penalties(penalties: List[Dict[str, Any]]) -> None:
-    PENALTIES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(PENALTIES_FILE, "w") as f:
-        json.dump(penalties, f, indent=4)
+    """Replace every penalty; the store is rebuilt on next use."""
+    global _store
+    with _store_lock:
+        get_storage().penalties.save(penalties)
+        _store = None
 
 def create_report(reporter_id: str, movie_id: str, reason: str, description: str = None) -> Dict[str, Any]:
-    reports = load_reports()
-    
-    new_report = {
-        "report_id": f"report_{len(reports) + 1}",
-        "reporter_id": reporter_id,
-        "movie_id": movie_id,
-        "reason": reason,
-        "description": description,
-        "status": "pending",
-        "created_at": datetime.utcnow().isoformat(),
-        "assigned_moderator": None,
-        "resolution": None,
-        "resolved_at": None,
-        "moderator_notes": None
-    }
-    
-    reports.append(new_report)
-    save_reports(reports)
+    with _store_lock:
+        store = get_report_store()
+        new_report = store.add_report({
+            "reporter_id": reporter_id,
+            "movie_id": movie_id,
+            "reason": reason,
+            "description": description,
+            "status": "pending",
+            "created_at": datetime.utcnow().isoformat(),
+            "assigned_moderator": None,
+            "resolution": None,
+            "resolved_at": None,
+            "moderator_notes": None
+        })
+        collection = get_storage().reports
+        ticket = collection.write(store.report_records(), changed=[new_report])
+    collection.wait(ticket)
     return new_report
 
-def get_reports_for_moderator() -> List[Dict[str, Any]]:
-    return [r for r in load_reports() if r["status"] == "pending"]
+def get_reports(status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Reports in creation order, optionally filtered by status, from the status index"""
+    return get_report_store().list_reports(status, limit)
+
+def get_reports_for_moderator(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Pending reports, oldest first, from the materialized stats"""
+    stats = get_moderation_stats()
+    return stats.pending_reports(stats.status_counts["pending"] if limit is None else limit)
 
 def get_report_by_id(report_id: str) -> Optional[Dict[str, Any]]:
-    reports = load_reports()
-    return next((r for r in reports if r["report_id"] == report_id), None)
-
-def update_report_status(report_id: str, status: str, moderator_id: str, notes: str = None) -> bool:
-    reports = load_reports()
-    for report in reports:
-        if report["report_id"] == report_id:
-            report["status"] = status
-            report["assigned_moderator"] = moderator_id
-            report["resolved_at"] = datetime.utcnow().isoformat()
-            if notes:
-                report["moderator_notes"] = notes
-            save_reports(reports)
-            return True
-    return False
+    return get_report_store().get_report(report_id)
 
-def apply_penalty_to_user(user_id: str, reason: str, severity: str, duration_days: int, report_id: str = None) -> Dict[str, Any]:
-    penalties = load_penalties()
-    
-    new_penalty = {
-        "penalty_id": f"penalty_{len(penalties) + 1}",
-        "user_id": user_id,
-        "reason": reason,
-        "severity": severity,
-        "duration_days": duration_days,
-        "report_id": report_id,
-        "created_at": datetime.utcnow().isoformat(),
-        "active": True
+def update_report_status(report_id: str, status: str, moderator_id: str, notes: str = None, expected_status: Optional[str] = None) -> bool:
+    """Set a report's status; with ``expected_status``, only if it still has that status."""
+    changes = {
+        "status": status,
+        "assigned_moderator": moderator_id,
+        "resolved_at": datetime.utcnow().isoformat()
     }
-    
-    penalties.append(new_penalty)
-    save_penalties(penalties)
+    if notes:
+        changes["moderator_notes"] = notes
+    with _store_lock:
+        store = get_report_store()
+        report = store.update_report(report_id, changes, expected_status)
+        if report is None:
+            return False
+        collection = get_storage().reports
+        ticket = collection.write(store.report_records(), changed=[report])
+    collection.wait(ticket)
+    return True
+
+def apply_penalty_to_user(user_id: str, reason: str, severity: str, duration_days: int, report_id: str = None) -> Dict[str, Any]:
+    with _store_lock:
+        store = get_report_store()
+        new_penalty = store.add_penalty({
+            "user_id": user_id,
+            "reason": reason,
+            "severity": severity,
+            "duration_days": duration_days,
+            "report_id": report_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "active": True
+        })
+        collection = get_storage().penalties
+        ticket = collection.write(store.penalty_records(), changed=[new_penalty])
+    collection.wait(ticket)
     
     # Also add penalty to user's record
     from backend.authentication import utils as auth_utils
-    users = auth_utils.load_users()
-    for user in users:
-        if user["user_id"] == user_id:
-            if "penalties" not in user:
-                user["penalties"] = []
-            user["penalties"].append(new_penalty["penalty_id"])
-            auth_utils.save_users(users)
-            break
+    user = auth_utils.get_user_by_id(user_id)
+    if user:
+        penalty_ids = user.get("penalties", []) + [new_penalty["penalty_id"]]
+        auth_utils.update_user(user_id, {"penalties": penalty_ids})
     
     return new_penalty
 
-def get_user_penalties(user_id: str) -> List[Dict[str, Any]]:
-    penalties = load_penalties()
-    return [p for p in penalties if p["user_id"] == user_id and p["active"]]
+def get_user_penalties(user_id: str, active_only: bool = True) -> List[Dict[str, Any]]:
+    """A user's penalties, oldest first, from the per-user index"""
+    return get_report_store().user_penalties(user_id, active_only)
 
 def dismiss_report(report_id: str, moderator_id: str, notes: str = None) -> bool:
-    return update_report_status(report_id, "dismissed", moderator_id, notes)
\ No newline at end of file
+    """Dismiss a report if it is still pending"""
+    return update_report_status(report_id, "dismissed", moderator_id, notes, expected_status="pending")
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Offline ingestion of review CSVs into compiled per-movie review files.
+
+Usage: python -m backend.reviews.ingest [--movies NAME ...] [--workers N] [--force]
+
+Streams each movie's movieReviews.csv, normalizes its headers and dates, and
+writes the columnar file the API memory-maps (backend/data/compiled/reviews),
+one movie per worker process. Files already compiled from the current CSV are
+kept unless --force is given. A manifest.json beside the compiled files
+records, per movie, the row count, undated rows, unrecognized headers and
+sha256 checksums of the CSV and the compiled file. Exits non-zero if any
+movie fails.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from backend.reviews import utils as review_utils
+from backend.reviews.store import normalize_header, source_signature
+from backend.storage.persistence import atomic_write
+
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1 << 20
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def unknown_headers(csv_file: Path) -> List[str]:
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None) or []
+    return [name for name in header if normalize_header(name) is None]
+
+def ingest_movie(movie_id: str, force: bool = False) -> Dict[str, Any]:
+    """Compile one movie's reviews if needed and describe the result; runs in a worker process."""
+    store = review_utils.review_store
+    csv_file = store.csv_path(movie_id)
+    started = time.perf_counter()
+
+    rebuilt = force or not store.is_compiled(movie_id)
+    compiled = store.build(movie_id) if rebuilt else store.get(movie_id)
+    date_ordinals = compiled.column("date_ordinal")
+    compiled_file = store.compiled_file(movie_id)
+
+    return {
+        "movie_id": movie_id,
+        "rows": len(compiled),
+        "undated_rows": sum(1 for ordinal in date_ordinals if ordinal == 0),
+        "unknown_headers": unknown_headers(csv_file),
+        "source": {
+            "file": str(csv_file.relative_to(store.data_path)),
+            "bytes": csv_file.stat().st_size,
+            "sha256": file_sha256(csv_file),
+        },
+        "compiled": {
+            "file": compiled_file.name,
+            "bytes": compiled_file.stat().st_size,
+            "sha256": file_sha256(compiled_file),
+        },
+        "rebuilt": rebuilt,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+def find_movies() -> List[str]:
+    """Movies that have a review CSV."""
+    store = review_utils.review_store
+    return sorted(
+        entry.name for entry in os.scandir(store.data_path)
+        if entry.is_dir() and source_signature(store.csv_path(entry.name)) is not None
+    )
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", nargs="+", metavar="NAME", help="Only ingest these movie folders")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Recompile even if the compiled file is current")
+    parser.add_argument("--manifest", type=Path, default=review_utils.COMPILED_PATH / "manifest.json")
+    args = parser.parse_args(argv)
+
+    movie_ids = args.movies or find_movies()
+    # A partial run keeps the other movies' entries; a full run starts over
+    movies = load_manifest(args.manifest).get("movies", {}) if args.movies else {}
+    failures = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {movie_id: pool.submit(ingest_movie, movie_id, args.force) for movie_id in movie_ids}
+        for movie_id, future in futures.items():
+            try:
+                entry = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"{movie_id}: FAILED ({type(e).__name__}: {e})")
+                continue
+            movies[movie_id] = entry
+            action = "compiled" if entry["rebuilt"] else "up to date"
+            print(f"{movie_id}: {entry['rows']} rows, {action} in {entry['seconds']:.2f}s")
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "movies": dict(sorted(movies.items())),
+    }
+    atomic_write(args.manifest, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    total = sum(entry["rows"] for entry in movies.values())
+    print(f"{len(movies)} movies, {total} rows in {time.perf_counter() - started:.1f}s; manifest: {args.manifest}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
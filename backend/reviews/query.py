@@ -0,0 +1,239 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend.reviews.reviewers import MovieReviewerIndex
+from backend.reviews.store import SORT_COLUMNS, ReviewColumns, is_missing, parse_review_date
+
+Predicate = Callable[[int], bool]
+
+# Sort option whose order permutation is sorted by each filterable column
+RANGE_ORDERS = {name: key for key, name in SORT_COLUMNS.items()}
+
+# Narrow to a range filter's rows when it keeps at most 1/NARROW_RATIO of them;
+# otherwise a lazy scan in sort order finds a page sooner than sorting them
+NARROW_RATIO = 4
+
+class InvalidFilter(ValueError):
+    """Raised when a filter value cannot be interpreted."""
+
+class ReviewFilter:
+    """Review filters compiled into a single row predicate over the columns.
+
+    Range filters only read their own column. Each one is also located in
+    its column's precomputed sort permutation with two binary searches, so
+    ``narrowest`` can hand ``paginate`` the matching rows of the most
+    selective range without scanning. With a reviewer index the user filter
+    becomes a sorted candidate row list (``rows``) that restricts the scan;
+    without one it decodes just the username of rows that survived the range
+    filters. ``empty`` is set when the filters can be shown to match nothing
+    without touching any row.
+    """
+
+    def __init__(
+        self,
+        columns: ReviewColumns,
+        user: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        min_usefulness_vote: Optional[int] = None,
+        min_total_votes: Optional[int] = None,
+        reviewers: Optional[MovieReviewerIndex] = None,
+    ):
+        self.columns = columns
+        self.empty = False
+        self.rows: Optional[List[int]] = None
+        # (sort option, start, end): positions in that option's permutation matching one range
+        self.ranges: List[Tuple[str, int, int]] = []
+        self._checks: List[Predicate] = []
+
+        self._add_range("date_ordinal", _date_ordinal(start_date, "start_date"), _date_ordinal(end_date, "end_date"))
+        self._add_range("rating", min_rating, max_rating)
+        # Missing vote counts are stored as -1, so never let them through
+        self._add_range("usefulness_vote", None if min_usefulness_vote is None else max(min_usefulness_vote, 0), None)
+        self._add_range("total_votes", None if min_total_votes is None else max(min_total_votes, 0), None)
+        if user and reviewers is not None:
+            self.rows = reviewers.rows_matching(user)
+            self.empty = self.empty or not self.rows
+        elif user:
+            self._add_user(user.lower())
+
+    @property
+    def predicate(self) -> Optional[Predicate]:
+        """The combined row predicate, or None when no filter is set."""
+        if not self._checks:
+            return None
+        combined = self._checks[0]
+        for check in self._checks[1:]:
+            combined = _both(combined, check)
+        return combined
+
+    def narrowest(self) -> Optional[Tuple[str, int, int]]:
+        """The range filter matching the fewest rows, or None without range filters."""
+        return min(self.ranges, key=lambda entry: entry[2] - entry[1], default=None)
+
+    def mask(self, rows: Iterable[int]) -> Iterator[int]:
+        """Lazily evaluate the predicate over ``rows``, yielding matching row numbers."""
+        predicate = self.predicate
+        if predicate is None:
+            return iter(rows)
+        return filter(predicate, rows)
+
+    def _add_range(self, name: str, low, high) -> None:
+        if low is None and high is None:
+            return
+
+        stats = self.columns.stats.get(name)
+        if stats is None or (low is not None and high is not None and low > high):
+            self.empty = True
+            return
+        col_min, col_max = stats
+        if (low is not None and low > col_max) or (high is not None and high < col_min):
+            self.empty = True
+            return
+        # Bounds that every present value already satisfies still exclude missing values
+        column = self.columns.column(name)
+        low = col_min if low is None or low < col_min else low
+        high = col_max if high is None or high > col_max else high
+        self._checks.append(lambda row: low <= column[row] <= high)
+
+        sort_key = RANGE_ORDERS[name]
+        permutation = self.columns.column(f"order_{sort_key}")
+        positions = range(self.columns.order_present[sort_key])
+        value_at = lambda position: column[permutation[position]]
+        start = bisect_left(positions, low, key=value_at)
+        end = bisect_right(positions, high, key=value_at)
+        if start >= end:
+            self.empty = True
+        self.ranges.append((sort_key, start, end))
+
+    def _add_user(self, needle: str) -> None:
+        text = self.columns.text
+        self._checks.append(lambda row: needle in text(row, "user").lower())
+
+class ReviewOrder:
+    """A sort order over one movie's reviews, backed by a precomputed permutation.
+
+    Position ``i`` in the order maps to a row in O(1). Every row has a sort key
+    that increases along the order, so a cursor holding the last row's key can
+    be resumed with a binary search instead of re-walking earlier pages.
+    """
+
+    def __init__(self, columns: ReviewColumns, sort_by: Optional[str] = None, order: str = "asc"):
+        self.columns = columns
+        self.sort_by = sort_by
+        self.descending = order == "desc"
+        self.count = len(columns)
+        if sort_by is None:
+            self.column_name = None
+        else:
+            self.column_name = SORT_COLUMNS[sort_by]
+            self.values = columns.column(self.column_name)
+            self.permutation = columns.column(f"order_{sort_by}")
+            self.present = columns.order_present[sort_by]
+
+    def row_at(self, position: int) -> int:
+        if self.column_name is None:
+            return self.count - 1 - position if self.descending else position
+        # Missing values stay last in both directions
+        if self.descending and position < self.present:
+            return self.permutation[self.present - 1 - position]
+        return self.permutation[position]
+
+    def key(self, row: int) -> Tuple:
+        if self.column_name is None:
+            return (-row,) if self.descending else (row,)
+        value = self.values[row]
+        if is_missing(self.column_name, value):
+            return (1, 0, row)
+        return (0, -value, -row) if self.descending else (0, value, row)
+
+    def rows_from(self, position: int) -> Iterator[int]:
+        """Yield rows in sort order starting at ``position``."""
+        return map(self.row_at, range(position, self.count))
+
+    def position_after(self, key: Tuple) -> int:
+        """Position of the first row whose key sorts after ``key``."""
+        return bisect_right(range(self.count), tuple(key), key=lambda position: self.key(self.row_at(position)))
+
+def paginate(
+    review_filter: ReviewFilter,
+    sort_by: Optional[str] = None,
+    order: str = "asc",
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Tuple[List[int], Optional[str]]:
+    """Return one page of matching rows in sort order plus the cursor for the next page.
+
+    With a cursor, ``skip`` is ignored and the scan resumes right after the
+    last row of the previous page.
+    """
+    if review_filter.empty or limit <= 0:
+        return [], None
+
+    review_order = ReviewOrder(review_filter.columns, sort_by, order)
+    after = decode_cursor(cursor, sort_by, order) if cursor else None
+    if after is not None:
+        skip = 0
+
+    columns = review_filter.columns
+    narrowest = review_filter.narrowest() if review_filter.rows is None else None
+    candidates: Optional[Sequence[int]] = None
+    if review_filter.rows is not None:
+        # Walk only the candidate rows, put into sort order
+        candidates = sorted(review_filter.rows, key=review_order.key)
+    elif narrowest is not None:
+        sort_key, start, end = narrowest
+        matching = columns.column(f"order_{sort_key}")[start:end]
+        if sort_key == sort_by:
+            # Already in sort order; ties are in row order, matching ReviewOrder.key
+            candidates = matching[::-1] if review_order.descending else matching
+        elif (end - start) * NARROW_RATIO <= len(columns):
+            candidates = sorted(matching, key=review_order.key)
+
+    if candidates is not None:
+        if after is not None:
+            candidates = candidates[bisect_right(candidates, tuple(after), key=review_order.key):]
+        scan = iter(candidates)
+    else:
+        scan = review_order.rows_from(0 if after is None else review_order.position_after(after))
+
+    rows = list(islice(review_filter.mask(scan), skip, skip + limit + 1))
+    page = rows[:limit]
+    next_cursor = encode_cursor(review_order.key(page[-1]), sort_by, order) if len(rows) > limit else None
+    return page, next_cursor
+
+def encode_cursor(key: Tuple, sort_by: Optional[str], order: str) -> str:
+    payload = json.dumps({"s": sort_by, "o": order, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: Optional[str], order: str) -> Tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key = tuple(payload["k"])
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise InvalidFilter("Invalid cursor")
+    if len(key) != (1 if sort_by is None else 3) or not all(isinstance(part, (int, float)) for part in key):
+        raise InvalidFilter("Invalid cursor")
+    if cursor_sort != sort_by or cursor_order != order:
+        raise InvalidFilter("Cursor does not match sort_by/order")
+    return key
+
+def _date_ordinal(value: Optional[str], name: str) -> Optional[int]:
+    if not value:
+        return None
+    parsed = parse_review_date(value)
+    if parsed is None:
+        raise InvalidFilter(f"Invalid {name}: expected YYYY-MM-DD or e.g. '31 March 2022'")
+    return parsed.toordinal()
+
+def _both(first: Predicate, second: Predicate) -> Predicate:
+    return lambda row: first(row) and second(row)
@@ -0,0 +1,127 @@
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.reviews.store import DerivedIndexes, ReviewColumns, ReviewStore
+
+class MovieReviewerIndex:
+    """Lowercase username -> review rows for one movie, plus a trigram index.
+
+    Substring lookups intersect the trigram postings of the needle to find
+    candidate usernames, so they only compare against a handful of distinct
+    names instead of every review row.
+    """
+
+    def __init__(self, source: Optional[Tuple[int, int]] = None):
+        self.source = source
+        self.row_count = 0
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+        self.rows_by_name: List[array] = []
+        self.trigrams: Dict[str, array] = {}
+
+    @classmethod
+    def build(cls, columns: ReviewColumns) -> "MovieReviewerIndex":
+        index = cls(columns.source)
+        for row in range(len(columns)):
+            index.add(row, columns.text(row, "user"))
+        return index
+
+    def add(self, row: int, username: str) -> None:
+        name = username.lower()
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+            self.rows_by_name.append(array("i"))
+            for trigram in _trigrams(name):
+                self.trigrams.setdefault(trigram, array("i")).append(name_id)
+        self.rows_by_name[name_id].append(row)
+        self.row_count = max(self.row_count, row + 1)
+
+    def append(self, review: Dict[str, Any]) -> None:
+        self.add(self.row_count, review.get("user") or "")
+
+    def rows_matching(self, needle: str) -> List[int]:
+        """Sorted rows whose username contains ``needle`` (case-insensitive)."""
+        needle = needle.lower()
+        rows: List[int] = []
+        for name_id in self._candidate_names(needle):
+            if needle in self.names[name_id]:
+                rows.extend(self.rows_by_name[name_id])
+        rows.sort()
+        return rows
+
+    def _candidate_names(self, needle: str) -> Iterable[int]:
+        trigrams = _trigrams(needle)
+        if not trigrams:
+            return range(len(self.names))
+        postings = sorted((self.trigrams.get(trigram, ()) for trigram in trigrams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return candidates
+
+class ReviewerIndex:
+    """Username lookups within one movie and across the whole catalog.
+
+    ``by_name`` maps each lowercase username to its review rows per movie,
+    sharing the row arrays of the per-movie indexes. It is updated as those
+    indexes are built, appended to or dropped, so a reviewer lookup reads a
+    single entry instead of visiting every movie.
+    """
+
+    def __init__(self, store: ReviewStore):
+        self.store = store
+        self.by_name: Dict[str, Dict[str, array]] = {}
+        # movie_id -> (folded index, how many of its names are in by_name)
+        self._folded: Dict[str, Tuple[Optional[MovieReviewerIndex], int]] = {}
+        self._lock = threading.Lock()
+        self.indexes = DerivedIndexes(store, MovieReviewerIndex.build, on_change=self._fold)
+
+    def reviews_by(self, username: str, movie_ids: Iterable[str]) -> List[Tuple[str, int]]:
+        """(movie_id, row) of every review written by ``username``, by movie id."""
+        movie_ids = set(movie_ids)
+        # Movies are only visited once, the first time they are looked up
+        for movie_id in movie_ids:
+            if movie_id not in self._folded and self.indexes.get(movie_id) is None:
+                with self._lock:
+                    self._folded.setdefault(movie_id, (None, 0))
+        # Re-check the movies with hits, in case their CSV changed on disk
+        for movie_id in {movie_id for movie_id, _ in self._lookup(username, movie_ids)}:
+            self.indexes.get(movie_id)
+        return self._lookup(username, movie_ids)
+
+    def _lookup(self, username: str, movie_ids: Set[str]) -> List[Tuple[str, int]]:
+        with self._lock:
+            rows_by_movie = self.by_name.get(username.lower(), {})
+            return [
+                (movie_id, row)
+                for movie_id in sorted(rows_by_movie) if movie_id in movie_ids
+                for row in rows_by_movie[movie_id]
+            ]
+
+    def _fold(self, movie_id: str, index: Optional[MovieReviewerIndex]) -> None:
+        """Bring ``by_name`` in line with a movie's current index."""
+        with self._lock:
+            folded, name_count = self._folded.get(movie_id, (None, 0))
+            if index is not folded:
+                if folded is not None:
+                    for name in folded.names:
+                        rows_by_movie = self.by_name[name]
+                        del rows_by_movie[movie_id]
+                        if not rows_by_movie:
+                            del self.by_name[name]
+                name_count = 0
+            if index is None:
+                self._folded.pop(movie_id, None)
+                return
+            for name_id in range(name_count, len(index.names)):
+                self.by_name.setdefault(index.names[name_id], {})[movie_id] = index.rows_by_name[name_id]
+            self._folded[movie_id] = (index, len(index.names))
+
+def _trigrams(text: str) -> List[str]:
+    return list({text[i:i + 3] for i in range(len(text) - 2)})
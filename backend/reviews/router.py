@@ -2,18 +2,51 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional
 from backend.reviews import schemas
 from backend.reviews import utils as review_utils
+from backend.reviews.query import InvalidFilter
 from backend.movies import utils as movie_utils
 from backend.authentication.security import get_current_user
-from backend.authentication import utils as auth_utils
 from backend.ratings import utils as ratings_utils
+from backend.dataloader.utils import RequestLoaders, get_loaders
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
+@router.get("/search", response_model=schemas.ReviewSearchResponse)
+async def search_reviews(
+    q: str = Query(..., min_length=1),
+    movie_id: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
+    """Full-text search over review titles and bodies, in one movie or across all"""
+    if movie_id is not None:
+        if not await loaders.movies.load(movie_id):
+            raise HTTPException(status_code=404, detail="Movie not found")
+        movie_ids = [movie_id]
+    else:
+        # Loading the catalog reads disk; keep it off the event loop like the scoring
+        movie_ids = await run_in_threadpool(lambda: [m["id"] for m in movie_utils.load_movies()])
+
+    # Scoring is CPU work; keep it off the event loop
+    results = await run_in_threadpool(review_utils.search_reviews, q, movie_ids, skip=skip, limit=limit)
+    return {"query": q, "results": results}
+
+@router.get("/reviewer/{username}", response_model=schemas.ReviewerReviewsResponse)
+def get_reviewer_reviews(
+    username: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """All reviews written by one reviewer across the catalog"""
+    movie_ids = [m["id"] for m in movie_utils.load_movies()]
+    reviews = review_utils.get_reviews_by_reviewer(username, movie_ids, skip=skip, limit=limit)
+    return {"username": username, "reviews": reviews}
+
 @router.get("/{movie_id}", response_model=schemas.ReviewListResponse)
 @movie_utils.movie_exists
 def get_reviews(
     movie_id: str,
-    movie: dict,
     user: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -21,47 +54,52 @@ def get_reviews(
     max_rating: Optional[float] = None,
     min_usefulness_vote: Optional[int] = None,
     min_total_votes: Optional[int] = None,
-    skip: int = 0,
-    limit: int = 50
+    sort_by: Optional[str] = Query(None, enum=["date", "rating", "usefulness_vote", "total_votes", "helpfulness"]),
+    order: Optional[str] = Query("asc", enum=["asc", "desc"]),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
 ):
-    reviews = review_utils.load_reviews(movie_id)
-
-    if user:
-        reviews = [r for r in reviews if r["user"] and user.lower() in r["user"].lower()]
-    if start_date:
-        reviews = [r for r in reviews if r["date"] and r["date"] >= start_date]
-    if end_date:
-        reviews = [r for r in reviews if r["date"] and r["date"] <= end_date]
-    if min_rating is not None:
-        reviews = [r for r in reviews if r["rating"] and r["rating"] >= min_rating]
-    if max_rating is not None:
-        reviews = [r for r in reviews if r["rating"] and r["rating"] <= max_rating]
-    if min_usefulness_vote is not None:
-        reviews = [r for r in reviews if r["usefulness_vote"] and r["usefulness_vote"] >= min_usefulness_vote]
-    if min_total_votes is not None:
-        reviews = [r for r in reviews if r["total_votes"] and r["total_votes"] >= min_total_votes]
+    try:
+        reviews, next_cursor = review_utils.query_reviews(
+            movie_id,
+            sort_by=sort_by,
+            order=order,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            user=user,
+            start_date=start_date,
+            end_date=end_date,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            min_usefulness_vote=min_usefulness_vote,
+            min_total_votes=min_total_votes,
+        )
+    except InvalidFilter as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"reviews": reviews[skip: skip + limit]}
+    return {"reviews": reviews, "next_cursor": next_cursor}
 
 @router.post("/{movie_id}")
 @movie_utils.movie_exists
-def add_review(
+async def add_review(
     movie_id: str,
-    movie: dict,
     review_data: schemas.ReviewCreate,
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
-    users = auth_utils.load_users()
-    user = next((u for u in users if u['user_id'] == current_user.user_id), None)
+    user = await loaders.users.load(current_user.user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # If rating is provided in review, also save it to ratings system
     if review_data.rating is not None:
-        ratings_utils.set_user_rating(current_user.user_id, movie_id, review_data.rating)
+        await run_in_threadpool(ratings_utils.set_user_rating, current_user.user_id, movie_id, review_data.rating)
 
-    new_review = review_utils.append_review_to_csv(
+    new_review = await run_in_threadpool(
+        review_utils.append_review_to_csv,
         movie_id=movie_id,
         username=user["username"],
         rating=review_data.rating,
@@ -12,6 +12,24 @@ class Review(BaseModel):
 
 class ReviewListResponse(BaseModel):
     reviews: List[Review]
+    next_cursor: Optional[str] = None
+
+class ReviewSearchHit(BaseModel):
+    movie_id: str
+    score: float
+    review: Review
+
+class ReviewSearchResponse(BaseModel):
+    query: str
+    results: List[ReviewSearchHit]
+
+class MovieReview(BaseModel):
+    movie_id: str
+    review: Review
+
+class ReviewerReviewsResponse(BaseModel):
+    username: str
+    reviews: List[MovieReview]
 
 class ReviewCreate(BaseModel):
     review_title: str
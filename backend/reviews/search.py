@@ -0,0 +1,122 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.reviews.store import DerivedIndexes, ReviewColumns, ReviewStore
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its "
+    "of on or she so that the their them they this to was were will with you".split()
+)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into indexable terms."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+class MovieSearchIndex:
+    """Inverted index over one movie's review titles and bodies.
+
+    Postings are stored per term as two parallel integer arrays (row numbers
+    and term frequencies); rows are appended in increasing order so the
+    arrays stay sorted as reviews are added.
+    """
+
+    def __init__(self, source: Optional[Tuple[int, int]] = None):
+        self.source = source
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.doc_lengths = array("i")
+        self.total_length = 0
+
+    @classmethod
+    def build(cls, columns: ReviewColumns) -> "MovieSearchIndex":
+        index = cls(columns.source)
+        for row in range(len(columns)):
+            index.add(row, columns.text(row, "title"), columns.text(row, "review"))
+        return index
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, row: int, title: str, review: str) -> None:
+        """Index one review; ``row`` must be the next row number."""
+        if row != self.doc_count:
+            raise ValueError(f"Expected row {self.doc_count}, got {row}")
+        terms = Counter(tokenize(title))
+        terms.update(tokenize(review))
+        for term, freq in terms.items():
+            rows, freqs = self.postings.get(term) or self.postings.setdefault(term, (array("i"), array("i")))
+            rows.append(row)
+            freqs.append(freq)
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+
+    def append(self, review: Dict[str, Any]) -> None:
+        self.add(self.doc_count, review.get("title") or "", review.get("review") or "")
+
+    def document_frequency(self, term: str) -> int:
+        entry = self.postings.get(term)
+        return len(entry[0]) if entry else 0
+
+    def score(self, terms: Iterable[str], idf: Dict[str, float], avg_length: float) -> Dict[int, float]:
+        """BM25 scores of every row matching at least one term."""
+        scores: Dict[int, float] = {}
+        lengths = self.doc_lengths
+        for term in terms:
+            entry = self.postings.get(term)
+            if not entry:
+                continue
+            weight = idf[term]
+            for row, freq in zip(*entry):
+                norm = K1 * (1 - B + B * lengths[row] / avg_length)
+                scores[row] = scores.get(row, 0.0) + weight * freq * (K1 + 1) / (freq + norm)
+        return scores
+
+class ReviewSearch:
+    """BM25 search over review text, within one movie or across many.
+
+    Per-movie indexes are built lazily from the compiled review store and
+    kept in sync with it through ``DerivedIndexes``.
+    """
+
+    def __init__(self, store: ReviewStore):
+        self.indexes = DerivedIndexes(store, MovieSearchIndex.build)
+
+    def search(self, query: str, movie_ids: Iterable[str], skip: int = 0, limit: int = 20) -> List[Tuple[str, int, float]]:
+        """Return (movie_id, row, score) hits ranked by BM25, best first.
+
+        Collection statistics are summed over all searched movies so scores
+        are comparable across them.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        indexes = [(movie_id, index) for movie_id in movie_ids if (index := self.indexes.get(movie_id)) is not None]
+        doc_count = sum(index.doc_count for _, index in indexes)
+        if not doc_count:
+            return []
+        avg_length = (sum(index.total_length for _, index in indexes) / doc_count) or 1.0
+
+        idf = {}
+        for term in terms:
+            df = sum(index.document_frequency(term) for _, index in indexes)
+            idf[term] = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+        hits = (
+            (score, movie_id, row)
+            for movie_id, index in indexes
+            for row, score in index.score(terms, idf, avg_length).items()
+        )
+        top = heapq.nlargest(skip + limit, hits, key=lambda hit: hit[0])[skip:]
+        return [(movie_id, row, score) for score, movie_id, row in top]
@@ -0,0 +1,454 @@
+import csv
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+MAGIC = b"WWREVS\x00\x01"
+FORMAT_VERSION = 3
+
+# Canonical column keys, keyed by lowercased CSV header
+HEADER_ALIASES = {
+    "date of review": "date",
+    "user": "user",
+    "usefulness vote": "usefulness_vote",
+    "total votes": "total_votes",
+    "user's rating out of 10": "rating",
+    "review title": "title",
+    "review": "review",
+}
+
+# Numeric columns are fixed-width arrays; missing values use the sentinel
+NUMERIC_COLUMNS = {
+    "date_ordinal": ("i", 0),
+    "usefulness_vote": ("i", -1),
+    "total_votes": ("i", -1),
+    "rating": ("d", math.nan),
+    "helpfulness": ("d", math.nan),
+}
+
+# Sort options and the numeric column each one orders by
+SORT_COLUMNS = {
+    "date": "date_ordinal",
+    "rating": "rating",
+    "usefulness_vote": "usefulness_vote",
+    "total_votes": "total_votes",
+    "helpfulness": "helpfulness",
+}
+
+# Text fields are stored per row, in this order, in one UTF-8 blob
+TEXT_FIELDS = ("date", "user", "title", "review")
+
+MONTHS = {
+    name: number for number, name in enumerate(
+        ["january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"], start=1)
+}
+
+def normalize_header(header: str) -> Optional[str]:
+    """Map a CSV header such as "User's Rating out of 10" to its column key."""
+    return HEADER_ALIASES.get(header.strip().lower())
+
+def parse_review_date(value: Optional[str]) -> Optional[date]:
+    """Parse "31 March 2022"-style or ISO review dates."""
+    if not value:
+        return None
+    value = value.strip()
+    parts = value.split()
+    if len(parts) == 3:
+        day, month, year = parts
+        month_number = MONTHS.get(month.lower())
+        if month_number and day.isdigit() and year.isdigit():
+            try:
+                return date(int(year), month_number, int(day))
+            except ValueError:
+                return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        return None
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    value = (value or "").strip().replace(",", "")
+    return int(value) if value.isdigit() else None
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float((value or "").strip())
+    except ValueError:
+        return None
+
+def parse_review_row(row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Convert a row keyed by canonical column keys into typed review fields."""
+    rating = _parse_float(row.get("rating"))
+    if rating is not None and math.isnan(rating):
+        rating = None
+    review_date = parse_review_date(row.get("date"))
+    usefulness_vote = _parse_int(row.get("usefulness_vote"))
+    total_votes = _parse_int(row.get("total_votes"))
+    return {
+        "date": row.get("date") or "",
+        "date_ordinal": review_date.toordinal() if review_date else None,
+        "user": row.get("user") or "",
+        "usefulness_vote": usefulness_vote,
+        "total_votes": total_votes,
+        "helpfulness": usefulness_vote / total_votes if usefulness_vote is not None and total_votes else None,
+        "rating": rating,
+        "title": row.get("title") or "",
+        "review": row.get("review") or "",
+    }
+
+def read_review_csv(csv_file: Path) -> Iterable[Dict[str, Any]]:
+    """Stream typed review rows from a CSV, normalizing its headers."""
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        keys = [normalize_header(h) for h in header]
+        for values in reader:
+            yield parse_review_row({key: value for key, value in zip(keys, values) if key})
+
+def is_missing(name: str, value: float) -> bool:
+    """Whether a numeric column value is that column's missing sentinel."""
+    return value != value or value == NUMERIC_COLUMNS[name][1]
+
+def source_signature(csv_file: Path) -> Optional[Tuple[int, int]]:
+    """Return (size, mtime_ns) of a review CSV, or None if it does not exist."""
+    try:
+        st = os.stat(csv_file)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+class ColumnBuilder:
+    """Accumulates typed review rows into columns for ``write``."""
+
+    def __init__(self):
+        self.count = 0
+        self.numeric = {name: array(code) for name, (code, _) in NUMERIC_COLUMNS.items()}
+        self.text_offsets = array("q", [0])
+        self.text = bytearray()
+
+    def add(self, review: Dict[str, Any]) -> None:
+        for name, (_, missing) in NUMERIC_COLUMNS.items():
+            value = review.get(name)
+            self.numeric[name].append(missing if value is None else value)
+        for field in TEXT_FIELDS:
+            self.text += (review.get(field) or "").encode("utf-8")
+            self.text_offsets.append(len(self.text))
+        self.count += 1
+
+    def write(self, path: Path, source: Optional[Tuple[int, int]]) -> None:
+        """Write the compiled file atomically via a temp file and rename."""
+        sections = [(name, column.typecode, column.tobytes()) for name, column in self.numeric.items()]
+        orders, present = self._orders()
+        sections.extend((f"order_{key}", "i", order.tobytes()) for key, order in orders.items())
+        sections.append(("text_offsets", "q", self.text_offsets.tobytes()))
+        sections.append(("text", "B", bytes(self.text)))
+
+        columns = {}
+        offset = 0
+        for name, typecode, data in sections:
+            columns[name] = [offset, typecode, len(data)]
+            offset += _padded(len(data))
+
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "count": self.count,
+            "source": list(source) if source else None,
+            "columns": columns,
+            "stats": self._stats(),
+            "order_present": present,
+        }).encode("utf-8")
+        prefix_len = _padded(len(MAGIC) + 4 + len(header))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp name, so concurrent builders never share a temp file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(struct.pack("<I", len(header)))
+                f.write(header)
+                f.write(b"\0" * (prefix_len - len(MAGIC) - 4 - len(header)))
+                for _, _, data in sections:
+                    f.write(data)
+                    f.write(b"\0" * (_padded(len(data)) - len(data)))
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _orders(self) -> Tuple[Dict[str, array], Dict[str, int]]:
+        """Ascending sort permutations per sort option, with missing values last."""
+        orders = {}
+        present = {}
+        for key, name in SORT_COLUMNS.items():
+            column = self.numeric[name]
+            rows = [row for row in range(self.count) if not is_missing(name, column[row])]
+            rows.sort(key=column.__getitem__)
+            present[key] = len(rows)
+            missing = [row for row in range(self.count) if is_missing(name, column[row])]
+            orders[key] = array("i", rows + missing)
+        return orders, present
+
+    def _stats(self) -> Dict[str, List[float]]:
+        """Min/max of each numeric column, ignoring missing values."""
+        stats = {}
+        for name in NUMERIC_COLUMNS:
+            present = [v for v in self.numeric[name] if not is_missing(name, v)]
+            if present:
+                stats[name] = [min(present), max(present)]
+        return stats
+
+class ReviewColumns:
+    """Read-only, memory-mapped view of one movie's compiled reviews.
+
+    Numeric columns are exposed as typed memoryviews over the mapping, so
+    filters only touch the columns they need and review text is decoded
+    on demand for the rows that are returned.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._mmap is None or self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a compiled review file")
+
+        header_len = struct.unpack_from("<I", self._mmap, len(MAGIC))[0]
+        start = len(MAGIC) + 4
+        header = json.loads(self._mmap[start:start + header_len])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported format version {header['version']}")
+
+        self.count: int = header["count"]
+        self.source = tuple(header["source"]) if header["source"] else None
+        self.stats: Dict[str, List[float]] = header["stats"]
+        self.order_present: Dict[str, int] = header["order_present"]
+        base = _padded(start + header_len)
+        view = memoryview(self._mmap)
+        self._columns = {}
+        for name, (offset, typecode, length) in header["columns"].items():
+            section = view[base + offset:base + offset + length]
+            self._columns[name] = section if typecode == "B" else section.cast(typecode)
+
+    def column(self, name: str) -> memoryview:
+        """Return a numeric column (or ``text_offsets``) as a typed memoryview."""
+        return self._columns[name]
+
+    def text(self, row: int, field: str) -> str:
+        """Decode a single text field of one row."""
+        slot = row * len(TEXT_FIELDS) + TEXT_FIELDS.index(field)
+        offsets = self._columns["text_offsets"]
+        return bytes(self._columns["text"][offsets[slot]:offsets[slot + 1]]).decode("utf-8")
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Materialize one review in the API's response shape."""
+        offsets = self._columns["text_offsets"]
+        blob = self._columns["text"]
+        slot = row * len(TEXT_FIELDS)
+        text = {
+            field: bytes(blob[offsets[slot + i]:offsets[slot + i + 1]]).decode("utf-8")
+            for i, field in enumerate(TEXT_FIELDS)
+        }
+        usefulness_vote = self._columns["usefulness_vote"][row]
+        total_votes = self._columns["total_votes"][row]
+        rating = self._columns["rating"][row]
+        return {
+            "date": text["date"],
+            "user": text["user"],
+            "usefulness_vote": None if usefulness_vote < 0 else usefulness_vote,
+            "total_votes": None if total_votes < 0 else total_votes,
+            "rating": None if math.isnan(rating) else rating,
+            "title": text["title"],
+            "review": text["review"],
+        }
+
+    def rows(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.row(row) for row in rows]
+
+    def __len__(self) -> int:
+        return self.count
+
+class ReviewStore:
+    """Lazily compiles per-movie review CSVs into columnar files and caches them.
+
+    A compiled file records the size and mtime of the CSV it was built from;
+    it is rebuilt on the next access after the CSV changes.
+    """
+
+    def __init__(self, data_path: Path, compiled_path: Path, csv_name: str):
+        self.data_path = data_path
+        self.compiled_path = compiled_path
+        self.csv_name = csv_name
+        self.derived: List[DerivedIndexes] = []
+        self._columns: Dict[str, ReviewColumns] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def csv_path(self, movie_id: str) -> Path:
+        return self.data_path / movie_id / self.csv_name
+
+    def compiled_file(self, movie_id: str) -> Path:
+        return self.compiled_path / f"{movie_id}.wwr"
+
+    def get(self, movie_id: str) -> Optional[ReviewColumns]:
+        """Return the compiled reviews for a movie, or None if it has no review CSV."""
+        source = source_signature(self.csv_path(movie_id))
+        if source is None:
+            return None
+
+        columns = self._columns.get(movie_id)
+        if columns is not None and columns.source == source:
+            return columns
+
+        with self._lock_for(movie_id):
+            columns = self._columns.get(movie_id)
+            if columns is not None and columns.source == source:
+                return columns
+            columns = self._open_compiled(movie_id, source) or self.build(movie_id)
+            self._columns[movie_id] = columns
+            return columns
+
+    def build(self, movie_id: str) -> ReviewColumns:
+        """Compile a movie's review CSV, replacing any existing compiled file.
+
+        Another process may be compiling the same movie. If writing or opening
+        our file fails, the CSV is re-stat'ed and the other builder's file is
+        used when it matches.
+        """
+        csv_file = self.csv_path(movie_id)
+        source = source_signature(csv_file)
+        builder = ColumnBuilder()
+        for review in read_review_csv(csv_file):
+            builder.add(review)
+        path = self.compiled_file(movie_id)
+        try:
+            builder.write(path, source)
+            return ReviewColumns(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            current = source_signature(csv_file)
+            columns = self._open_compiled(movie_id, current) if current is not None else None
+            if columns is None:
+                raise
+            return columns
+
+    def is_compiled(self, movie_id: str) -> bool:
+        """Whether the movie's compiled file exists and was built from its current CSV."""
+        source = source_signature(self.csv_path(movie_id))
+        return source is not None and self._open_compiled(movie_id, source) is not None
+
+    def notify_append(
+        self,
+        movie_id: str,
+        review: Dict[str, Any],
+        previous_source: Optional[Tuple[int, int]],
+        source: Optional[Tuple[int, int]],
+    ) -> None:
+        """Let derived indexes pick up a review appended to a movie's CSV."""
+        for indexes in self.derived:
+            indexes.append(movie_id, review, previous_source, source)
+
+    def invalidate(self, movie_id: str) -> None:
+        self._columns.pop(movie_id, None)
+
+    def _open_compiled(self, movie_id: str, source: Tuple[int, int]) -> Optional[ReviewColumns]:
+        path = self.compiled_file(movie_id)
+        if not path.exists():
+            return None
+        try:
+            columns = ReviewColumns(path)
+        except (ValueError, KeyError, json.JSONDecodeError, struct.error):
+            return None
+        return columns if columns.source == source else None
+
+    def _lock_for(self, movie_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(movie_id, threading.Lock())
+
+IndexT = TypeVar("IndexT")
+
+class DerivedIndexes(Generic[IndexT]):
+    """Per-movie indexes derived from compiled reviews and kept in sync with them.
+
+    Indexes are built lazily with ``build(columns)`` and rebuilt when the
+    review CSV changes. Index objects carry a ``source`` signature and an
+    ``append(review)`` method, which ``ReviewStore.notify_append`` uses to
+    index a newly appended review in place. ``on_change(movie_id, index)``,
+    if given, is called under the lock whenever a movie's index is built or
+    appended to, and with None when it is dropped.
+    """
+
+    def __init__(
+        self,
+        store: "ReviewStore",
+        build: Callable[[ReviewColumns], IndexT],
+        on_change: Optional[Callable[[str, Optional[IndexT]], None]] = None,
+    ):
+        self.store = store
+        self.build = build
+        self.on_change = on_change
+        self._indexes: Dict[str, IndexT] = {}
+        self._lock = threading.RLock()
+        store.derived.append(self)
+
+    def get(self, movie_id: str) -> Optional[IndexT]:
+        columns = self.store.get(movie_id)
+        if columns is None:
+            return None
+        index = self._indexes.get(movie_id)
+        if index is not None and index.source == columns.source:
+            return index
+        with self._lock:
+            index = self._indexes.get(movie_id)
+            if index is None or index.source != columns.source:
+                index = self.build(columns)
+                self._indexes[movie_id] = index
+                self._changed(movie_id, index)
+            return index
+
+    def append(
+        self,
+        movie_id: str,
+        review: Dict[str, Any],
+        previous_source: Optional[Tuple[int, int]],
+        source: Optional[Tuple[int, int]],
+    ) -> None:
+        """Index a review appended to a movie's CSV.
+
+        The index is only updated in place if it was built from exactly the
+        CSV as it was before the append; otherwise it is dropped and rebuilt
+        on next use.
+        """
+        with self._lock:
+            index = self._indexes.get(movie_id)
+            if index is None:
+                self._changed(movie_id, None)
+                return
+            if index.source != previous_source:
+                del self._indexes[movie_id]
+                self._changed(movie_id, None)
+                return
+            index.append(review)
+            index.source = source
+            self._changed(movie_id, index)
+
+    def _changed(self, movie_id: str, index: Optional[IndexT]) -> None:
+        if self.on_change is not None:
+            self.on_change(movie_id, index)
+
+def _padded(length: int) -> int:
+    return (length + 7) & ~7
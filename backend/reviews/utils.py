@@ -1,33 +1,76 @@
-import json
 import csv
-import os
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from backend.reviews.store import ReviewStore, ReviewColumns, source_signature
+from backend.reviews.query import ReviewFilter, paginate
+from backend.reviews.search import ReviewSearch
+from backend.reviews.reviewers import ReviewerIndex
 
 DATA_PATH = Path("backend/data/movieData")
+COMPILED_PATH = Path("backend/data/compiled/reviews")
+REVIEWS_FILENAME = "movieReviews.csv"
 
-def load_reviews(movie_id: str) -> List[Dict[str, Any]]:
-    """Load reviews for a movie from its folder."""
-    movie_dir = DATA_PATH / movie_id
-    reviews_file = movie_dir / "reviews.csv"
+review_store = ReviewStore(DATA_PATH, COMPILED_PATH, REVIEWS_FILENAME)
+review_search = ReviewSearch(review_store)
+reviewer_index = ReviewerIndex(review_store)
+
+# Serializes appends so each new review's row number is known
+_append_lock = threading.Lock()
 
-    if not reviews_file.exists():
+def get_review_columns(movie_id: str) -> Optional[ReviewColumns]:
+    """Get the compiled, memory-mapped reviews for a movie."""
+    return review_store.get(movie_id)
+
+def load_reviews(movie_id: str) -> List[Dict[str, Any]]:
+    """Load reviews for a movie from its compiled review store."""
+    columns = get_review_columns(movie_id)
+    if columns is None:
         return []
+    return columns.rows(range(len(columns)))
 
+def query_reviews(
+    movie_id: str,
+    sort_by: Optional[str] = None,
+    order: str = "asc",
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    **filters: Any
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Filter and sort a movie's reviews, decoding only the requested page.
+
+    Returns the page and an opaque cursor for the next page, if there is one.
+    """
+    columns = get_review_columns(movie_id)
+    if columns is None:
+        return [], None
+    reviewers = reviewer_index.indexes.get(movie_id) if filters.get("user") else None
+    review_filter = ReviewFilter(columns, reviewers=reviewers, **filters)
+    rows, next_cursor = paginate(review_filter, sort_by, order, skip, limit, cursor)
+    return columns.rows(rows), next_cursor
+
+def search_reviews(query: str, movie_ids: List[str], skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+    """Full-text search over review titles and bodies, ranked by BM25."""
+    hits = review_search.search(query, movie_ids, skip, limit)
+    results = []
+    for movie_id, row, score in hits:
+        columns = get_review_columns(movie_id)
+        if columns is None or row >= len(columns):
+            continue
+        results.append({"movie_id": movie_id, "score": score, "review": columns.row(row)})
+    return results
+
+def get_reviews_by_reviewer(username: str, movie_ids: List[str], skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+    """All reviews written by one reviewer across the given movies."""
+    hits = reviewer_index.reviews_by(username, movie_ids)[skip:skip + limit]
     reviews = []
-    with open(reviews_file, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            reviews.append({
-                "date": row.get("Date of Review"),
-                "user": row.get("User"),
-                "usefulness_vote": int(row["Usefulness Vote"]) if row.get("Usefulness Vote") else None,
-                "total_votes": int(row["Total Votes"]) if row.get("Total Votes") else None,
-                "rating": float(row["User's rating out of 10"]) if row.get("User's rating out of 10") else None,
-                "title": row.get("Review Title"),
-                "review": row.get("Review")
-            })
+    for movie_id, row in hits:
+        columns = get_review_columns(movie_id)
+        if columns is None or row >= len(columns):
+            continue
+        reviews.append({"movie_id": movie_id, "review": columns.row(row)})
     return reviews
 
 def append_review_to_csv(movie_id: str, username: str, rating: float, title: str, review_text: str) -> Dict[str, Any]:
@@ -35,34 +78,44 @@ def append_review_to_csv(movie_id: str, username: str, rating: float, title: str
     movie_dir = DATA_PATH / movie_id
     movie_dir.mkdir(exist_ok=True)
     
-    csv_file = movie_dir / "reviews.csv"
-    file_exists = os.path.exists(csv_file)
+    csv_file = movie_dir / REVIEWS_FILENAME
 
     fieldnames = ["Date of Review", "User", "Usefulness Vote", "Total Votes", 
-                  "User's rating out of 10", "Review Title", "Review"]
+                  "User's Rating out of 10", "Review Title", "Review"]
 
     new_review = {
         "Date of Review": datetime.utcnow().strftime("%d %B %Y"),
         "User": username,
         "Usefulness Vote": 0,
         "Total Votes": 0,
-        "User's rating out of 10": rating,
+        "User's Rating out of 10": rating,
         "Review Title": title,
         "Review": review_text
     }
 
-    with open(csv_file, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(new_review)
+    with _append_lock:
+        previous_source = source_signature(csv_file)
+        file_exists = previous_source is not None
+
+        with open(csv_file, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            if not file_exists:
+                writer.writeheader()
+            writer.writerow(new_review)
+
+        review_store.notify_append(
+            movie_id,
+            {"user": username, "title": title, "review": review_text},
+            previous_source=previous_source,
+            source=source_signature(csv_file),
+        )
 
     return {
         "date": new_review["Date of Review"],
         "user": new_review["User"],
         "usefulness_vote": new_review["Usefulness Vote"],
         "total_votes": new_review["Total Votes"],
-        "rating": float(new_review["User's rating out of 10"]) if new_review["User's rating out of 10"] else None,
+        "rating": float(new_review["User's Rating out of 10"]) if new_review["User's Rating out of 10"] else None,
         "title": new_review["Review Title"],
         "review": new_review["Review"]
     }
\ No newline at end of file
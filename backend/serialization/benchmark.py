@@ -0,0 +1,111 @@
+"""Size and speed of the JSON encodings on the shipped dataset.
+
+Usage: python -m backend.serialization.benchmark [--repeat N]
+
+Data files: a ratings.json built from every rating in the shipped review
+CSVs and the shipped users.json, written the old way (json.dump, indent=4),
+with compact separators, and with orjson when it is installed.
+
+Responses: a full GET /movies page and one movie's reviews rendered the way
+FastAPI did by default (pydantic validation plus starlette's JSONResponse),
+through FastJSONResponse, and served from the pre-serialized ResponseCache.
+"""
+import argparse
+import json
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+
+from backend.movies import schemas as movie_schemas
+from backend.movies import utils as movie_utils
+from backend.reviews import schemas as review_schemas
+from backend.reviews import utils as review_utils
+from backend.reviews.store import read_review_csv
+from backend.serialization import utils as serialization
+from backend.serialization.responses import FastJSONResponse, ResponseCache
+from backend.storage.persistence import read_json
+from backend.storage.utils import DATA_DIR
+
+def shipped_ratings() -> Dict[str, Dict[str, float]]:
+    """{user: {movie: rating}} for every rated review in the shipped CSVs."""
+    ratings: Dict[str, Dict[str, float]] = {}
+    for csv_file in sorted(review_utils.DATA_PATH.glob(f"*/{review_utils.REVIEWS_FILENAME}")):
+        movie_id = csv_file.parent.name
+        for review in read_review_csv(csv_file):
+            if review["rating"] is not None and review["user"]:
+                ratings.setdefault(review["user"], {})[movie_id] = review["rating"]
+    return ratings
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Best per-call time in milliseconds."""
+    number, _ = timeit.Timer(func).autorange()
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def encoders(data: Any) -> List[Tuple[str, Callable[[], bytes]]]:
+    options = [
+        ("json indent=4", lambda: json.dumps(data, indent=4).encode("utf-8")),
+        ("json compact", lambda: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")),
+    ]
+    if serialization.orjson is not None:
+        options.append(("orjson", lambda: serialization.orjson.dumps(data)))
+    return options
+
+def bench_data_file(name: str, data: Any, repeat: int) -> None:
+    print(f"\n{name}")
+    for label, encode in encoders(data):
+        print(f"  {label:<16} {len(encode()):>10,} bytes  {best_of(encode, repeat):8.3f} ms")
+
+def bench_response(name: str, model: Any, payload: Dict[str, Any], repeat: int) -> None:
+    def default() -> bytes:
+        return JSONResponse(model(**payload).model_dump(mode="json")).body
+
+    def fast() -> bytes:
+        return FastJSONResponse(model(**payload).model_dump(mode="json")).body
+
+    cache = ResponseCache()
+    cache.get_or_render(name, lambda: model(**payload).model_dump(mode="json"))
+
+    def cached() -> bytes:
+        return cache.response(name, lambda: None).body
+
+    print(f"\n{name}")
+    for label, render in (("FastAPI default", default), ("FastJSONResponse", fast), ("ResponseCache hit", cached)):
+        print(f"  {label:<18} {len(render()):>10,} bytes  {best_of(render, repeat):8.3f} ms")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"encoder: {'orjson' if serialization.USE_ORJSON else 'json'}")
+
+    ratings = shipped_ratings()
+    count = sum(len(user_ratings) for user_ratings in ratings.values())
+    bench_data_file(f"ratings.json ({count:,} ratings, {len(ratings):,} users)", ratings, args.repeat)
+    bench_data_file("users.json (shipped)", read_json(DATA_DIR / "users.json", []), args.repeat)
+
+    movies = movie_utils.load_movies()
+    bench_response(
+        f"GET /movies ({len(movies)} movies)",
+        movie_schemas.MovieListResponse,
+        {"movies": movies, "total": len(movies)},
+        args.repeat,
+    )
+
+    movie_id = max(
+        (path.parent.name for path in review_utils.DATA_PATH.glob(f"*/{review_utils.REVIEWS_FILENAME}")),
+        key=lambda m: len(review_utils.get_review_columns(m)),
+    )
+    reviews, _ = review_utils.query_reviews(movie_id, limit=200)
+    bench_response(
+        f"GET /reviews/{movie_id} (200 reviews)",
+        review_schemas.ReviewListResponse,
+        {"reviews": reviews},
+        args.repeat,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from fastapi.responses import JSONResponse, Response
+
+from backend.serialization.utils import dumps
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with serialization.utils.dumps (orjson when available)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class ResponseCache:
+    """LRU of pre-serialized JSON response bodies.
+
+    Keys must include whatever versions the payload depends on (e.g. the
+    catalog version), so stale entries are simply never looked up again and
+    age out.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Hashable, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = dumps(build())
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return body
+
+    def response(self, key: Hashable, build: Callable[[], Any]) -> Response:
+        """A response carrying the cached body for ``key``, building it on a miss."""
+        return Response(content=self.get_or_render(key, build), media_type="application/json")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,35 @@
+import json
+import os
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# "auto" uses orjson when it is installed, "json" forces the standard library
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto")
+if JSON_ENCODER == "orjson" and orjson is None:
+    raise RuntimeError("JSON_ENCODER=orjson but orjson is not installed")
+USE_ORJSON = orjson is not None and JSON_ENCODER != "json"
+
+# Indentation for data files under backend/data; unset writes compact JSON
+DATA_FILE_INDENT: Optional[int] = int(os.environ["DATA_FILE_INDENT"]) if os.getenv("DATA_FILE_INDENT") else None
+
+def dumps(data: Any, indent: Optional[int] = None) -> bytes:
+    """Serialize to UTF-8 JSON bytes, compact unless ``indent`` is given."""
+    if USE_ORJSON and indent in (None, 2):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent is None:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON; raises json.JSONDecodeError on bad input with either encoder."""
+    if USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_data_file(data: Any) -> bytes:
+    """Serialize a backend/data file using DATA_FILE_INDENT."""
+    return dumps(data, DATA_FILE_INDENT)
@@ -0,0 +1,73 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from backend.authentication import utils as auth_utils
+from backend.movies import utils as movie_utils
+from backend.ratings import utils as ratings_utils
+from backend.reports import utils as report_utils
+from backend.reviews import utils as review_utils
+from backend.startup.warmup import Warmup
+
+# "0" skips warm-up: the app is ready at once and loads everything lazily
+WARMUP_ENABLED = os.getenv("WARMUP", "1") != "0"
+# Compile review CSVs into columnar files across this many processes first; 0 compiles in-process
+WARMUP_REVIEW_PROCESSES = int(os.getenv("WARMUP_REVIEW_PROCESSES", "0"))
+
+logger = logging.getLogger("uvicorn.error")
+
+def _movie_ids() -> List[str]:
+    return [movie["id"] for movie in movie_utils.load_movies()]
+
+def _compile_reviews(movie_id: str) -> int:
+    # Runs in a worker process; the parent then only has to open the compiled file
+    columns = review_utils.get_review_columns(movie_id)
+    return len(columns) if columns is not None else 0
+
+def warm_catalog() -> str:
+    movie_utils.catalog.refresh(force=True)
+    movie_utils.catalog.index()
+    return f"{len(movie_utils.catalog)} movies"
+
+def warm_review_files() -> str:
+    movie_ids = _movie_ids()
+    # Spawned, not forked: the parent has threads (warm-up, revocation refresh) and open locks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=WARMUP_REVIEW_PROCESSES, mp_context=context) as pool:
+        reviews = sum(pool.map(_compile_reviews, movie_ids))
+    return f"{reviews} reviews in {len(movie_ids)} movies, {WARMUP_REVIEW_PROCESSES} processes"
+
+def warm_review_indexes() -> str:
+    movie_ids = _movie_ids()
+    for movie_id in movie_ids:
+        review_utils.review_search.indexes.get(movie_id)
+        review_utils.reviewer_index.indexes.get(movie_id)
+    return f"{len(movie_ids)} movies"
+
+def warm_users() -> str:
+    return f"{len(auth_utils.get_user_repository())} users"
+
+def warm_ratings() -> str:
+    store = ratings_utils.get_ratings_store()
+    return f"{len(store.by_user)} users, {len(store.by_movie)} movies"
+
+def warm_reports() -> str:
+    store = report_utils.get_report_store()
+    return f"{len(store.reports)} reports, {len(store.penalties)} penalties"
+
+def build_warmup() -> Warmup:
+    warmup = Warmup(log=logger.info)
+    if not WARMUP_ENABLED:
+        return warmup
+    warmup.stage("catalog", warm_catalog)
+    if WARMUP_REVIEW_PROCESSES > 0:
+        warmup.stage("review_files", warm_review_files)
+    warmup.stage("review_indexes", warm_review_indexes)
+    warmup.stage("users", warm_users)
+    warmup.stage("ratings", warm_ratings)
+    warmup.stage("reports", warm_reports)
+    return warmup
+
+warmup = build_warmup()
@@ -0,0 +1,60 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class Warmup:
+    """Runs named startup stages in order, timing each one.
+
+    A stage that raises is recorded as failed and the remaining stages still
+    run: everything warmed here would otherwise be loaded lazily on first
+    use, so a failure only costs latency. ``ready`` is set once every stage
+    has finished. ``cancel`` stops the run after the current stage.
+    """
+
+    def __init__(self, log: Optional[Callable[[str], None]] = None):
+        self.log = log or (lambda message: None)
+        self.stages: List[Tuple[str, Callable[[], Optional[str]]]] = []
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.ready = threading.Event()
+        self.cancelled = threading.Event()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def stage(self, name: str, func: Callable[[], Optional[str]]) -> None:
+        """Add a stage; ``func`` may return a short detail string for the report."""
+        self.stages.append((name, func))
+
+    def run(self) -> None:
+        self.started_at = time.perf_counter()
+        for name, func in self.stages:
+            if self.cancelled.is_set():
+                self.log(f"Warm-up cancelled before {name}")
+                return
+            self.results[name] = {"status": "running"}
+            started = time.perf_counter()
+            try:
+                detail = func()
+            except Exception as e:
+                result = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+            else:
+                result = {"status": "done", "detail": detail}
+            result["seconds"] = round(time.perf_counter() - started, 3)
+            self.results[name] = result
+            note = result.get("detail") or result.get("error")
+            self.log(f"Warm-up {name}: {result['status']} in {result['seconds']:.3f}s" + (f" ({note})" if note else ""))
+        self.finished_at = time.perf_counter()
+        self.log(f"Warm-up finished in {self.finished_at - self.started_at:.3f}s")
+        self.ready.set()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def status(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.perf_counter()) - self.started_at, 3)
+        return {
+            "ready": self.ready.is_set(),
+            "seconds": elapsed,
+            "stages": {name: self.results.get(name, {"status": "pending"}) for name, _ in self.stages},
+        }
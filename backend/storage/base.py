@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+class DocumentCollection(ABC):
+    """A collection of JSON-like records keyed by one id field (users, reports, penalties)."""
+
+    key: str
+
+    @abstractmethod
+    def load(self) -> List[Dict[str, Any]]:
+        """Every record in the collection."""
+
+    @abstractmethod
+    def write(self, records: List[Dict[str, Any]], changed: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Queue the collection for persisting and return a ticket for ``wait``.
+
+        ``records`` is the full collection. ``changed`` optionally names the
+        records that differ from what was loaded; backends that can write
+        single records only write those, others rewrite ``records`` whole.
+        Records are serialized before this returns, so callers may keep
+        mutating them.
+        """
+
+    @abstractmethod
+    def wait(self, ticket: int) -> None:
+        """Block until the write with ``ticket`` is durable."""
+
+    def sync(self) -> None:
+        """Block until every queued write is durable."""
+
+    def save(self, records: List[Dict[str, Any]], changed: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.wait(self.write(records, changed))
+
+    @abstractmethod
+    def signature(self) -> Optional[Hashable]:
+        """A value that changes when the collection is modified outside this process."""
+
+class RatingsCollection(ABC):
+    """User ratings, written one change at a time: {user_id: {movie_id: rating}}."""
+
+    @abstractmethod
+    def load(self) -> Dict[str, Dict[str, float]]:
+        """Every rating, with all changes written so far applied."""
+
+    @abstractmethod
+    def load_rated_at(self) -> Dict[str, Dict[str, str]]:
+        """When each current rating was set, {user_id: {movie_id: ISO timestamp}}.
+
+        Ratings saved without a timestamp (e.g. through ``replace_all``) are left out.
+        """
+
+    def load_state(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, str]], Optional[Hashable]]:
+        """``load()``, ``load_rated_at()`` and the signature they were read at."""
+        signature = self.signature()
+        return self.load(), self.load_rated_at(), signature
+
+    def read_since(self, signature: Optional[Hashable]) -> Optional[Tuple[List[Dict[str, Any]], Hashable]]:
+        """The changes written since ``signature`` and the signature after them.
+
+        None if they cannot be told apart, in which case everything is reloaded.
+        """
+        return None
+
+    @abstractmethod
+    def write(self, record: Dict[str, Any]) -> int:
+        """Record a change ({"op": "set"|"delete", "user", "movie", "rating", "ts"}) and return a ticket."""
+
+    def advance(self, signature: Optional[Hashable]) -> Optional[Hashable]:
+        """``signature`` moved past this process's latest ``write``, for a reader that applied it itself."""
+        return signature
+
+    @abstractmethod
+    def wait(self, ticket: int) -> None:
+        """Block until the change with ``ticket`` is durable."""
+
+    @abstractmethod
+    def replace_all(self, ratings: Dict[str, Dict[str, float]]) -> None:
+        """Replace every rating."""
+
+    @abstractmethod
+    def needs_compaction(self) -> bool:
+        """Whether ``compact`` should be called."""
+
+    @abstractmethod
+    def compact(self, known: Optional[Hashable] = None) -> Optional[Hashable]:
+        """Fold pending changes into the backend's base representation, from what is stored.
+
+        If ``known`` was the signature just before, returns the signature
+        after, so a reader that was up to date can stay so; otherwise None.
+        """
+
+    @abstractmethod
+    def signature(self) -> Optional[Hashable]:
+        """A value that changes when ratings are modified outside this process."""
+
+class WatchLaterCollection(ABC):
+    """Each user's watch-later list, stored per user so one change never rewrites the others."""
+
+    @abstractmethod
+    def load(self, user_id: str) -> Optional[List[str]]:
+        """The user's movie ids in the order they were added, or None if no list was ever saved."""
+
+    @abstractmethod
+    def save(self, user_id: str, movie_ids: List[str]) -> None:
+        """Replace the user's list."""
+
+    @abstractmethod
+    def signature(self, user_id: str) -> Optional[Hashable]:
+        """A value that changes when the user's list is modified outside this process."""
+
+class Storage(ABC):
+    """The persistent collections the *utils modules read and write through."""
+
+    name: str
+    users: DocumentCollection
+    ratings: RatingsCollection
+    reports: DocumentCollection
+    penalties: DocumentCollection
+    watch_later: WatchLaterCollection
+
+    def close(self) -> None:
+        pass
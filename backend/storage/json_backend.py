@@ -0,0 +1,213 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from backend.ratings.wal import RatingsLog, apply_rated_at, apply_record
+from backend.storage.base import DocumentCollection, RatingsCollection, Storage, WatchLaterCollection
+from backend.storage.persistence import (
+    CoalescingWriter,
+    atomic_write_json,
+    encode_json,
+    file_lock,
+    file_signature,
+    read_json,
+)
+
+class JsonDocumentCollection(DocumentCollection):
+    """A JSON array file, rewritten whole; writes close together share one rewrite."""
+
+    def __init__(self, path: Path, key: str, coalesce_delay: float = 0.005, fsync: bool = True):
+        self.path = Path(path)
+        self.key = key
+        self.writer = CoalescingWriter(self.path, coalesce_delay, fsync, on_replace=self._written)
+        self._known: Optional[Tuple[int, int]] = None
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+
+    def load(self) -> List[Dict[str, Any]]:
+        self.writer.sync()
+        return read_json(self.path, [])
+
+    def write(self, records: List[Dict[str, Any]], changed: Optional[List[Dict[str, Any]]] = None) -> int:
+        # A JSON array can only be rewritten whole, so ``changed`` is not used
+        return self.writer.write(encode_json(records))
+
+    def wait(self, ticket: int) -> None:
+        self.writer.wait(ticket)
+
+    def sync(self) -> None:
+        self.writer.sync()
+
+    def signature(self) -> int:
+        """Bumped whenever the file changes other than through this collection's writes."""
+        with file_lock(self.path).read(), self._generation_lock:
+            current = file_signature(self.path)
+            if current != self._known:
+                self._known = current
+                self._generation += 1
+            return self._generation
+
+    def _written(self) -> None:
+        # Runs under the file's write lock, so signature() never sees our file before this
+        with self._generation_lock:
+            self._known = file_signature(self.path)
+
+class JsonRatingsCollection(RatingsCollection):
+    """A ratings.json snapshot plus an append-only log of changes since it was written.
+
+    When each rating was set is kept beside the snapshot in a file with the
+    same shape ({user_id: {movie_id: timestamp}}), so ratings.json itself
+    keeps its original format.
+
+    Other processes may append to the log and compact it. The signature is
+    (snapshot signature, log inode, log size): while the snapshot and inode
+    stay the same the log only grows, so ``read_since`` can hand back just
+    the new records. Snapshot and log are read under the log's shared lock
+    and compacted under its exclusive lock, always from what is on disk.
+    """
+
+    def __init__(self, path: Path, log: RatingsLog, compact_after: int, fsync: bool = True):
+        self.path = Path(path)
+        self.rated_at_path = self.path.with_name(self.path.stem + "_rated_at.json")
+        self.log = log
+        self.compact_after = compact_after
+        self.fsync = fsync
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        return self.load_state()[0]
+
+    def load_snapshot(self) -> Dict[str, Dict[str, float]]:
+        return read_json(self.path, {})
+
+    def load_rated_at(self) -> Dict[str, Dict[str, str]]:
+        return self.load_state()[1]
+
+    def load_state(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, str]], Optional[Hashable]]:
+        with self.log.lock(exclusive=False):
+            return self._read_all()
+
+    def read_since(self, signature: Optional[Hashable]) -> Optional[Tuple[List[Dict[str, Any]], Hashable]]:
+        if not isinstance(signature, tuple):
+            return None
+        snapshot, ino, offset = signature
+        with self.log.lock(exclusive=False):
+            current = self.log.stat()
+            if file_signature(self.path) != snapshot or current is None or current[1] < offset:
+                return None
+            # A log that did not exist yet may since have been created
+            if current[0] != ino and not (ino is None and offset == 0):
+                return None
+            records, offset = self.log.read(offset)
+            return records, (snapshot, current[0], offset)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """The log's records, oldest first."""
+        return self.log.replay()
+
+    def write(self, record: Dict[str, Any]) -> int:
+        return self.log.write(record)
+
+    def wait(self, ticket: int) -> None:
+        self.log.wait(ticket)
+
+    def advance(self, signature: Optional[Hashable]) -> Optional[Hashable]:
+        # Our latest append directly follows what ``signature`` covers: cover it too
+        if isinstance(signature, tuple) and self.log.last_append is not None:
+            snapshot, ino, offset = signature
+            append_ino, start, end = self.log.last_append
+            if offset == start and (ino == append_ino or (ino is None and start == 0)):
+                return snapshot, append_ino, end
+        return signature
+
+    def needs_compaction(self) -> bool:
+        return self.log.pending() >= self.compact_after
+
+    def replace_all(self, ratings: Dict[str, Dict[str, float]]) -> None:
+        with self.log.lock():
+            self._write_snapshot(ratings, {})
+
+    def compact(self, known: Optional[Hashable] = None) -> Optional[Hashable]:
+        with self.log.lock():
+            ratings, rated_at, before = self._read_all()
+            self._write_snapshot(ratings, rated_at)
+            after = self.signature()
+        return after if known is not None and known == before else None
+
+    def save_snapshot(self, ratings: Dict[str, Dict[str, float]]) -> None:
+        """Write ratings.json atomically (temp file, fsync, rename)."""
+        atomic_write_json(self.path, ratings, fsync=self.fsync)
+
+    def signature(self) -> Tuple[Optional[Tuple[int, int]], Optional[int], int]:
+        ino, size = self.log.stat() or (None, 0)
+        return file_signature(self.path), ino, size
+
+    def _read_all(self) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Dict[str, str]], Tuple[Any, ...]]:
+        # Called with the log's lock held
+        ratings = self.load_snapshot()
+        rated_at = read_json(self.rated_at_path, {})
+        ino, _ = self.log.stat() or (None, 0)
+        records, offset = self.log.read()
+        for record in records:
+            apply_record(ratings, record)
+            apply_rated_at(rated_at, record)
+        return ratings, rated_at, (file_signature(self.path), ino, offset)
+
+    def _write_snapshot(self, ratings: Dict[str, Dict[str, float]], rated_at: Dict[str, Dict[str, str]]) -> None:
+        # Called with the log's exclusive lock held, so no record can land between writing and truncating
+        self.save_snapshot(ratings)
+        # Written before the log is truncated, so a crash in between only replays records again
+        atomic_write_json(self.rated_at_path, rated_at, fsync=self.fsync)
+        self.log.truncate()
+
+class JsonWatchLaterCollection(WatchLaterCollection):
+    """One small JSON array file per user."""
+
+    def __init__(self, directory: Path, fsync: bool = True):
+        self.directory = Path(directory)
+        self.fsync = fsync
+
+    def load(self, user_id: str) -> Optional[List[str]]:
+        return read_json(self._path(user_id), None)
+
+    def save(self, user_id: str, movie_ids: List[str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self._path(user_id), movie_ids, fsync=self.fsync)
+
+    def signature(self, user_id: str) -> Optional[Tuple[int, int]]:
+        return file_signature(self._path(user_id))
+
+    def _path(self, user_id: str) -> Path:
+        # User ids are uuid4 strings; refuse anything that could leave the directory
+        if not user_id or Path(user_id).name != user_id:
+            raise ValueError(f"Invalid user id: {user_id!r}")
+        return self.directory / f"{user_id}.json"
+
+class JsonStorage(Storage):
+    """The original flat files under backend/data."""
+
+    name = "json"
+
+    def __init__(
+        self,
+        data_dir: Path,
+        commit_delay: float = 0.002,
+        fsync: bool = True,
+        compact_after: int = 1000,
+        coalesce_delay: float = 0.005,
+    ):
+        self.data_dir = Path(data_dir)
+        self.users = JsonDocumentCollection(self.data_dir / "users.json", "user_id", coalesce_delay, fsync)
+        self.reports = JsonDocumentCollection(self.data_dir / "reports.json", "report_id", coalesce_delay, fsync)
+        self.penalties = JsonDocumentCollection(self.data_dir / "penalties.json", "penalty_id", coalesce_delay, fsync)
+        self.watch_later = JsonWatchLaterCollection(self.data_dir / "watch_later", fsync)
+        self.ratings = JsonRatingsCollection(
+            self.data_dir / "ratings.json",
+            RatingsLog(self.data_dir / "ratings.log", commit_delay=commit_delay, fsync=fsync),
+            compact_after,
+            fsync,
+        )
+
+    def close(self) -> None:
+        for collection in (self.users, self.reports, self.penalties):
+            collection.sync()
+        self.ratings.log.close()
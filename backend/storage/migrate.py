@@ -0,0 +1,74 @@
+"""One-shot import of the JSON files and review CSVs into a SQLite database.
+
+Usage: python -m backend.storage.migrate [--db PATH] [--skip-reviews]
+
+Reads users.json, reports.json, penalties.json, ratings.json (plus the ratings
+log), the per-user watch-later files and every movie's review CSV, and writes
+them into the SQLite database used by STORAGE_BACKEND=sqlite. Each collection
+is replaced in its own transaction, so the import can be re-run safely.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from backend.reviews.store import read_review_csv
+from backend.reviews.utils import DATA_PATH, REVIEWS_FILENAME
+from backend.storage import utils as storage_utils
+from backend.storage.json_backend import JsonStorage
+from backend.storage.sqlite_backend import SqliteStorage
+
+def rating_rows(source: JsonStorage) -> Dict[Tuple[str, str], Tuple[float, Optional[str]]]:
+    """Final rating per (user, movie), with rated_at where one was recorded."""
+    rated_at = source.ratings.load_rated_at()
+    return {
+        (user_id, movie_id): (rating, rated_at.get(user_id, {}).get(movie_id))
+        for user_id, user_ratings in source.ratings.load().items()
+        for movie_id, rating in user_ratings.items()
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=storage_utils.SQLITE_PATH, help="SQLite database to write")
+    parser.add_argument("--skip-reviews", action="store_true", help="Do not import review CSVs")
+    args = parser.parse_args(argv)
+
+    source = JsonStorage(storage_utils.DATA_DIR)
+    target = SqliteStorage(args.db)
+    started = time.perf_counter()
+    try:
+        for name in ("users", "reports", "penalties"):
+            records = getattr(source, name).load()
+            getattr(target, name).save(records)
+            print(f"{name}: {len(records)}")
+
+        # Users whose list was never moved out of users.json keep it in their record
+        users = source.users.load()
+        for user in users:
+            movie_ids = source.watch_later.load(user["user_id"])
+            target.watch_later.save(user["user_id"], user.get("watch_later", []) if movie_ids is None else movie_ids)
+        print(f"watch_later: {len(users)}")
+
+        rows = rating_rows(source)
+        target.ratings.import_rows(
+            (user_id, movie_id, rating, rated_at) for (user_id, movie_id), (rating, rated_at) in rows.items()
+        )
+        print(f"ratings: {len(rows)}")
+
+        if not args.skip_reviews:
+            total = 0
+            for csv_file in sorted(DATA_PATH.glob(f"*/{REVIEWS_FILENAME}")):
+                count = target.import_reviews(csv_file.parent.name, read_review_csv(csv_file))
+                print(f"reviews: {csv_file.parent.name}: {count}")
+                total += count
+            print(f"reviews: {total}")
+    finally:
+        target.close()
+        source.close()
+
+    print(f"Imported into {args.db} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from backend.serialization.utils import dumps_data_file, loads
+
+try:
+    import fcntl
+except ImportError:  # Windows: process_lock falls back to the in-process file_lock
+    fcntl = None
+
+class ReadWriteLock:
+    """Many readers or one writer. A waiting writer blocks new readers so writes are not starved."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+_file_locks: Dict[str, ReadWriteLock] = {}
+_file_locks_guard = threading.Lock()
+
+def file_lock(path: Path) -> ReadWriteLock:
+    """The process-wide reader/writer lock for one file."""
+    key = os.path.abspath(path)
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = _file_locks[key] = ReadWriteLock()
+        return lock
+
+@contextmanager
+def process_lock(path: Path, exclusive: bool = True) -> Iterator[None]:
+    """An flock on ``path`` that excludes other processes as well as other threads.
+
+    Every call opens its own descriptor, since flock locks belong to the open
+    file: two threads sharing one descriptor would share (and release) its lock.
+    """
+    if fcntl is None:
+        lock = file_lock(path)
+        with lock.write() if exclusive else lock.read():
+            yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def read_json(path: Path, default: Any) -> Any:
+    """Parse a JSON file under its read lock; ``default`` if it is missing or invalid."""
+    with file_lock(path).read():
+        try:
+            with open(path, "rb") as f:
+                return loads(f.read())
+        except FileNotFoundError:
+            return default
+        except json.JSONDecodeError:
+            return default
+
+def encode_json(data: Any) -> bytes:
+    """Serialize a data file (compact unless DATA_FILE_INDENT is set)."""
+    return dumps_data_file(data)
+
+def atomic_write(
+    path: Path,
+    data: bytes,
+    fsync: bool = True,
+    on_replace: Optional[Callable[[], None]] = None,
+) -> None:
+    """Replace ``path`` with ``data`` via a temp file in the same directory and os.replace.
+
+    Readers see the old or the new file, never a truncated one. ``on_replace``
+    runs right after the rename, still under the file's write lock.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path).write():
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+            if on_replace is not None:
+                on_replace()
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        if fsync:
+            _fsync_dir(path.parent)
+
+def atomic_write_json(path: Path, data: Any, fsync: bool = True) -> None:
+    atomic_write(path, encode_json(data), fsync)
+
+class CoalescingWriter:
+    """Group commit for a file that is always rewritten whole.
+
+    ``write`` queues the latest serialized contents and returns a ticket;
+    ``wait`` blocks until a write covering that ticket is on disk. The first
+    waiter becomes the leader: it holds the write open for ``delay`` seconds so
+    later mutations can replace the queued contents, then writes once for all
+    of them.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        delay: float = 0.005,
+        fsync: bool = True,
+        on_replace: Optional[Callable[[], None]] = None,
+    ):
+        self.path = Path(path)
+        self.delay = delay
+        self.fsync = fsync
+        self.on_replace = on_replace
+        self.flushes = 0
+        self._pending: Optional[bytes] = None
+        self._queued = 0
+        self._written = 0
+        self._writing = False
+        self._cond = threading.Condition()
+
+    def write(self, data: bytes) -> int:
+        with self._cond:
+            self._pending = data
+            self._queued += 1
+            return self._queued
+
+    def wait(self, ticket: int) -> None:
+        with self._cond:
+            while self._written < ticket:
+                if self._writing:
+                    self._cond.wait()
+                    continue
+                self._writing = True
+                try:
+                    self._cond.release()
+                    try:
+                        time.sleep(self.delay)
+                    finally:
+                        self._cond.acquire()
+                    self._flush()
+                finally:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def sync(self) -> None:
+        """Wait for everything queued so far."""
+        with self._cond:
+            ticket = self._queued
+        self.wait(ticket)
+
+    def _flush(self) -> None:
+        # Called with the condition held; write outside it so mutations keep queueing
+        data, target = self._pending, self._queued
+        self._pending = None
+        self._cond.release()
+        try:
+            if data is not None:
+                atomic_write(self.path, data, self.fsync, self.on_replace)
+        except BaseException:
+            self._cond.acquire()
+            if self._queued == target:
+                self._pending = data
+            raise
+        self._cond.acquire()
+        self._written = max(self._written, target)
+        self.flushes += 1
+
+def _fsync_dir(path: Path) -> None:
+    # Makes the rename itself durable; not supported everywhere
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
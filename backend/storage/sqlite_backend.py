@@ -0,0 +1,280 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from backend.serialization.utils import dumps, loads
+from backend.storage.base import DocumentCollection, RatingsCollection, Storage, WatchLaterCollection
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL COLLATE NOCASE UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    user_id TEXT NOT NULL,
+    movie_id TEXT NOT NULL,
+    rating REAL NOT NULL,
+    rated_at TEXT,
+    PRIMARY KEY (user_id, movie_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ratings_movie ON ratings (movie_id);
+CREATE TABLE IF NOT EXISTS reports (
+    report_id TEXT PRIMARY KEY,
+    status TEXT,
+    reporter_id TEXT,
+    movie_id TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_status ON reports (status);
+CREATE INDEX IF NOT EXISTS idx_reports_reporter ON reports (reporter_id);
+CREATE TABLE IF NOT EXISTS penalties (
+    penalty_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    active INTEGER,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_penalties_user ON penalties (user_id, active);
+CREATE TABLE IF NOT EXISTS watch_later (
+    user_id TEXT PRIMARY KEY,
+    movie_ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    movie_id TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    date TEXT,
+    date_ordinal INTEGER,
+    user TEXT,
+    usefulness_vote INTEGER,
+    total_votes INTEGER,
+    rating REAL,
+    title TEXT,
+    review TEXT,
+    UNIQUE (movie_id, row)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_user ON reviews (user);
+CREATE INDEX IF NOT EXISTS idx_reviews_movie_date ON reviews (movie_id, date_ordinal);
+CREATE INDEX IF NOT EXISTS idx_reviews_movie_rating ON reviews (movie_id, rating);
+"""
+
+REVIEW_COLUMNS = ("date", "date_ordinal", "user", "usefulness_vote", "total_votes", "rating", "title", "review")
+
+class SqliteDatabase:
+    """One connection shared by every collection, serialized by a lock.
+
+    Statements are parameterized constants, so sqlite3's statement cache
+    prepares each one once per connection.
+    """
+
+    def __init__(self, path: Path, fsync: bool = True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=" + ("FULL" if fsync else "NORMAL"))
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # executescript would commit on its own, so run the statements inside one transaction
+        with self.transaction():
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self.conn.execute(statement)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def data_version(self) -> int:
+        # Changes only when another connection commits, so our own writes keep it stable
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+class SqliteDocumentCollection(DocumentCollection):
+    """Records stored as JSON text, with the fields we query on copied into indexed columns."""
+
+    def __init__(self, db: SqliteDatabase, table: str, key: str, columns: Dict[str, Callable[[Dict[str, Any]], Any]]):
+        self.db = db
+        self.table = table
+        self.key = key
+        self.columns = columns
+        names = [key, *columns, "data"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        self._upsert_sql = (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        )
+        self._select_sql = f"SELECT data FROM {table} ORDER BY rowid"
+        self._prune_sql = f"DELETE FROM {table} WHERE {key} NOT IN (SELECT value FROM json_each(?))"
+
+    def load(self) -> List[Dict[str, Any]]:
+        return [loads(data) for (data,) in self.db.query(self._select_sql)]
+
+    def write(self, records: List[Dict[str, Any]], changed: Optional[List[Dict[str, Any]]] = None) -> int:
+        with self.db.transaction() as conn:
+            if changed is None:
+                conn.execute(self._prune_sql, (json.dumps([record[self.key] for record in records]),))
+                changed = records
+            conn.executemany(self._upsert_sql, [self._row(record) for record in changed])
+        return 0
+
+    def wait(self, ticket: int) -> None:
+        # Committed synchronously by write
+        pass
+
+    def signature(self) -> int:
+        return self.db.data_version()
+
+    def _row(self, record: Dict[str, Any]) -> Tuple:
+        values = [extract(record) for extract in self.columns.values()]
+        return (record[self.key], *values, dumps(record).decode("utf-8"))
+
+class SqliteRatingsCollection(RatingsCollection):
+    """One row per (user, movie); each change is its own transaction, so nothing needs compacting."""
+
+    SET_SQL = (
+        "INSERT INTO ratings (user_id, movie_id, rating, rated_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (user_id, movie_id) DO UPDATE SET rating = excluded.rating, rated_at = excluded.rated_at"
+    )
+    DELETE_SQL = "DELETE FROM ratings WHERE user_id = ? AND movie_id = ?"
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+        self._written = 0
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        ratings: Dict[str, Dict[str, float]] = {}
+        for user_id, movie_id, rating in self.db.query("SELECT user_id, movie_id, rating FROM ratings"):
+            ratings.setdefault(user_id, {})[movie_id] = rating
+        return ratings
+
+    def load_rated_at(self) -> Dict[str, Dict[str, str]]:
+        rated_at: Dict[str, Dict[str, str]] = {}
+        for user_id, movie_id, timestamp in self.db.query(
+            "SELECT user_id, movie_id, rated_at FROM ratings WHERE rated_at IS NOT NULL"
+        ):
+            rated_at.setdefault(user_id, {})[movie_id] = timestamp
+        return rated_at
+
+    def write(self, record: Dict[str, Any]) -> int:
+        with self.db.transaction() as conn:
+            if record["op"] == "set":
+                conn.execute(self.SET_SQL, (record["user"], record["movie"], record["rating"], record.get("ts")))
+            elif record["op"] == "delete":
+                conn.execute(self.DELETE_SQL, (record["user"], record["movie"]))
+            self._written += 1
+            return self._written
+
+    def wait(self, ticket: int) -> None:
+        # Committed synchronously by write
+        pass
+
+    def needs_compaction(self) -> bool:
+        return False
+
+    def compact(self, known: Optional[Hashable] = None) -> Optional[Hashable]:
+        # Rows are already the base representation; only the WAL needs folding in
+        with self.db.lock:
+            self.db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return known
+
+    def replace_all(self, ratings: Dict[str, Dict[str, float]]) -> None:
+        self.import_rows(
+            (user_id, movie_id, rating, None)
+            for user_id, user_ratings in ratings.items()
+            for movie_id, rating in user_ratings.items()
+        )
+
+    def import_rows(self, rows: Iterable[Tuple[str, str, float, Optional[str]]]) -> None:
+        """Replace every rating with (user_id, movie_id, rating, rated_at) rows."""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM ratings")
+            conn.executemany(self.SET_SQL, rows)
+
+    def signature(self) -> int:
+        return self.db.data_version()
+
+class SqliteWatchLaterCollection(WatchLaterCollection):
+    """One row per user holding the list as a JSON array."""
+
+    SAVE_SQL = (
+        "INSERT INTO watch_later (user_id, movie_ids) VALUES (?, ?) "
+        "ON CONFLICT (user_id) DO UPDATE SET movie_ids = excluded.movie_ids"
+    )
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def load(self, user_id: str) -> Optional[List[str]]:
+        rows = self.db.query("SELECT movie_ids FROM watch_later WHERE user_id = ?", (user_id,))
+        return loads(rows[0][0]) if rows else None
+
+    def save(self, user_id: str, movie_ids: List[str]) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(self.SAVE_SQL, (user_id, dumps(movie_ids).decode("utf-8")))
+
+    def signature(self, user_id: str) -> int:
+        return self.db.data_version()
+
+class SqliteStorage(Storage):
+    """Every collection in one SQLite database in WAL mode."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, fsync: bool = True):
+        self.db = SqliteDatabase(path, fsync=fsync)
+        self.users = SqliteDocumentCollection(self.db, "users", "user_id", {
+            "username": lambda user: user["username"],
+            "email": lambda user: user["email"],
+        })
+        self.reports = SqliteDocumentCollection(self.db, "reports", "report_id", {
+            "status": lambda report: report.get("status"),
+            "reporter_id": lambda report: report.get("reporter_id"),
+            "movie_id": lambda report: report.get("movie_id"),
+            "created_at": lambda report: report.get("created_at"),
+        })
+        self.penalties = SqliteDocumentCollection(self.db, "penalties", "penalty_id", {
+            "user_id": lambda penalty: penalty.get("user_id"),
+            "active": lambda penalty: int(bool(penalty.get("active"))),
+            "created_at": lambda penalty: penalty.get("created_at"),
+        })
+        self.ratings = SqliteRatingsCollection(self.db)
+        self.watch_later = SqliteWatchLaterCollection(self.db)
+
+    def import_reviews(self, movie_id: str, reviews: Iterable[Dict[str, Any]]) -> int:
+        """Replace a movie's reviews with typed rows from reviews.store.read_review_csv."""
+        sql = f"INSERT INTO reviews (movie_id, row, {', '.join(REVIEW_COLUMNS)}) VALUES ({', '.join('?' * (len(REVIEW_COLUMNS) + 2))})"
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM reviews WHERE movie_id = ?", (movie_id,))
+            rows = (
+                (movie_id, row, *(review[column] for column in REVIEW_COLUMNS))
+                for row, review in enumerate(reviews)
+            )
+            return conn.executemany(sql, rows).rowcount
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,48 @@
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from backend.storage.base import Storage
+
+DATA_DIR = Path(os.path.dirname(__file__), "..", "data")
+
+# "json" (the flat files in backend/data) or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+SQLITE_PATH = Path(os.getenv("SQLITE_PATH", str(DATA_DIR / "watchworthy.db")))
+
+STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", "1") != "0"
+# Writes of a whole JSON file within this window are coalesced into one rewrite
+WRITE_COALESCE_DELAY = float(os.getenv("WRITE_COALESCE_MS", "5")) / 1000
+
+RATINGS_COMMIT_DELAY = float(os.getenv("RATINGS_COMMIT_DELAY_MS", "2")) / 1000
+RATINGS_FSYNC = os.getenv("RATINGS_FSYNC", "1") != "0"
+# Compact the ratings log into ratings.json once it holds this many records
+RATINGS_COMPACT_AFTER = int(os.getenv("RATINGS_COMPACT_AFTER", "1000"))
+
+_storage: Optional[Storage] = None
+_storage_lock = threading.Lock()
+
+def open_storage(backend: str) -> Storage:
+    if backend == "json":
+        from backend.storage.json_backend import JsonStorage
+        return JsonStorage(
+            DATA_DIR,
+            commit_delay=RATINGS_COMMIT_DELAY,
+            fsync=RATINGS_FSYNC and STORAGE_FSYNC,
+            compact_after=RATINGS_COMPACT_AFTER,
+            coalesce_delay=WRITE_COALESCE_DELAY,
+        )
+    if backend == "sqlite":
+        from backend.storage.sqlite_backend import SqliteStorage
+        return SqliteStorage(SQLITE_PATH, fsync=STORAGE_FSYNC)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+def get_storage() -> Storage:
+    """The process-wide storage backend selected by STORAGE_BACKEND."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = open_storage(STORAGE_BACKEND)
+    return _storage
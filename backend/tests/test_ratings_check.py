@@ -0,0 +1,32 @@
+from backend.ratings.store import RatingsStore
+from backend.storage.json_backend import JsonStorage
+
+def _store_and_disk(tmp_path):
+    storage = JsonStorage(tmp_path, commit_delay=0, fsync=False)
+    ratings = storage.ratings
+    for user_id, movie_id, rating in [("u1", "m1", 7), ("u1", "m2", 8), ("u2", "m1", 5)]:
+        ratings.wait(ratings.write({"op": "set", "user": user_id, "movie": movie_id, "rating": rating}))
+    on_disk, rated_at, _ = ratings.load_state()
+    return RatingsStore(on_disk, rated_at), ratings.load()
+
+def test_consistent_store_has_no_problems(tmp_path):
+    store, on_disk = _store_and_disk(tmp_path)
+    assert store.check_consistency(on_disk) == []
+
+def test_reports_a_corrupt_movie_major_index(tmp_path):
+    store, on_disk = _store_and_disk(tmp_path)
+    store.by_movie["m1"]["u2"] = 9
+    assert store.check_consistency(on_disk) == ["m1/u2: disk has 5, movie-major has 9"]
+
+def test_reports_a_stale_aggregate(tmp_path):
+    store, on_disk = _store_and_disk(tmp_path)
+    store.aggregates.remove("m2", 8)
+    assert store.check_consistency(on_disk) == ["m2: aggregate count/histogram out of date"]
+
+def test_reports_a_rating_missing_from_memory(tmp_path):
+    store, on_disk = _store_and_disk(tmp_path)
+    on_disk["u2"]["m2"] = 6
+    problems = store.check_consistency(on_disk)
+    assert "u2/m2: disk has 6, user-major has None" in problems
+    assert "m2/u2: disk has 6, movie-major has None" in problems
+    assert "m2: aggregate count/histogram out of date" in problems
@@ -0,0 +1,73 @@
+import multiprocessing
+from pathlib import Path
+
+from backend.storage.json_backend import JsonStorage
+
+def _storage(data_dir: Path, compact_after: int = 1000) -> JsonStorage:
+    return JsonStorage(data_dir, commit_delay=0, fsync=False, compact_after=compact_after)
+
+def _set(storage: JsonStorage, user_id: str, movie_id: str, rating: float) -> None:
+    ratings = storage.ratings
+    ratings.wait(ratings.write({"op": "set", "user": user_id, "movie": movie_id, "rating": rating, "ts": "2024-01-01T00:00:00+00:00"}))
+
+def _append_ratings(data_dir: str, user_id: str, count: int) -> None:
+    storage = _storage(Path(data_dir))
+    for i in range(count):
+        _set(storage, user_id, f"movie_{i}", i % 10)
+    storage.close()
+
+def test_replay_skips_a_torn_record_and_keeps_later_appends(tmp_path):
+    storage = _storage(tmp_path)
+    _set(storage, "u1", "m1", 7)
+    _set(storage, "u1", "m2", 8)
+    storage.close()
+    # A crash mid-append leaves half a record at the end of the log
+    with open(tmp_path / "ratings.log", "ab") as f:
+        f.write(b'{"op": "set", "user": "u1", "mov')
+
+    restarted = _storage(tmp_path)
+    assert restarted.ratings.load() == {"u1": {"m1": 7, "m2": 8}}
+
+    _set(restarted, "u2", "m1", 5)
+    assert _storage(tmp_path).ratings.load() == {"u1": {"m1": 7, "m2": 8}, "u2": {"m1": 5}}
+
+def test_compaction_keeps_records_appended_by_other_processes(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    writers = [
+        context.Process(target=_append_ratings, args=(str(tmp_path), f"user_{n}", 200))
+        for n in range(3)
+    ]
+    for writer in writers:
+        writer.start()
+    storage = _storage(tmp_path)
+    while any(writer.is_alive() for writer in writers):
+        storage.ratings.compact()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    storage.ratings.compact()
+
+    expected = {f"user_{n}": {f"movie_{i}": i % 10 for i in range(200)} for n in range(3)}
+    assert storage.ratings.load_snapshot() == expected
+    assert _storage(tmp_path).ratings.load() == expected
+    assert (tmp_path / "ratings.log").stat().st_size == 0
+
+def test_stores_sharing_a_directory_see_each_others_writes(tmp_path):
+    first, second = _storage(tmp_path), _storage(tmp_path)
+    _, _, seen = second.ratings.load_state()
+
+    _set(first, "u1", "m1", 6)
+    assert second.ratings.signature() != seen
+    records, seen = second.ratings.read_since(seen)
+    assert [(record["user"], record["movie"], record["rating"]) for record in records] == [("u1", "m1", 6)]
+    assert second.ratings.signature() == seen
+
+    # A compaction elsewhere rewrites the snapshot, so the tail no longer applies
+    first.ratings.compact()
+    assert second.ratings.read_since(seen) is None
+    ratings, rated_at, seen = second.ratings.load_state()
+    assert ratings == {"u1": {"m1": 6}}
+    assert rated_at == {"u1": {"m1": "2024-01-01T00:00:00+00:00"}}
+
+    _set(second, "u2", "m2", 9)
+    assert first.ratings.load() == {"u1": {"m1": 6}, "u2": {"m2": 9}}